@@ -1,11 +1,44 @@
 import os
 import datetime
+import functools
 import json
 import logging
+import random
+import time
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
-from retry import retry
+
+# Resumable uploads send the file in chunks of this size so a failed chunk is resent alone
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# Only rate limiting, server errors and an expired token are worth another attempt
+RETRYABLE_STATUSES = {401, 429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 3
+MAX_BACKOFF_SECONDS = 30
+
+def is_retryable(error):
+    return isinstance(error, HttpError) and error.resp.status in RETRYABLE_STATUSES
+
+def backoff_delay(attempt):
+    return min(2 ** attempt + random.random(), MAX_BACKOFF_SECONDS)
+
+def retry_transient(func):
+    """Retry a Drive call on retryable HTTP statuses with jittered exponential backoff"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        attempt = 1
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except HttpError as e:
+                if attempt >= MAX_ATTEMPTS or not is_retryable(e):
+                    raise
+                delay = backoff_delay(attempt)
+                logging.warning(f"{func.__name__} failed with HTTP {e.resp.status}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+    return wrapper
 
 class SavingOnDrive:
     """Class to handle uploading files to Google Drive with date-based folders"""
@@ -25,13 +58,19 @@ class SavingOnDrive:
             "1hxBqJwK5g7EXAV0JcVc0_YLtBReCkaRv"   # Second folder
         ]
     
-    def authenticate(self):
+    def authenticate(self, force=False):
         """
-        Authenticate with Google Drive API using service account credentials
+        Authenticate with Google Drive API using service account credentials.
+        The service is built once and reused until a request is rejected as unauthorized.
         
+        Args:
+            force: Rebuild the service even if one already exists
+            
         Returns:
             bool: True if authentication successful, False otherwise
         """
+        if self.drive_service and not force:
+            return True
         try:
             if not self.credentials_json:
                 logging.error("No credentials provided. Ensure TALABAT_GCLOUD_KEY_JSON is set.")
@@ -58,7 +97,53 @@ class SavingOnDrive:
             logging.error(f"Authentication error: {str(e)}")
             return False
     
-    @retry(tries=3, delay=2, backoff=2, logger=logging.getLogger(__name__))
+    def reset_on_unauthorized(self, error):
+        """Drop the cached service after a 401 so the next attempt authenticates again"""
+        if isinstance(error, HttpError) and error.resp.status == 401:
+            logging.warning("Google Drive rejected the credentials, re-authenticating on next attempt")
+            self.drive_service = None
+    
+    def date_folder_query(self, parent_folder_id, today_date):
+        """Build the files().list request that looks up a date folder in a parent folder"""
+        query = f"name='{today_date}' and mimeType='application/vnd.google-apps.folder' and '{parent_folder_id}' in parents and trashed=false"
+        return self.drive_service.files().list(
+            q=query,
+            spaces='drive',
+            fields='files(id, name)'
+        )
+    
+    def find_date_folders(self, parent_folder_ids):
+        """
+        Look up today's folder in every parent folder with a single batch request
+        
+        Args:
+            parent_folder_ids: IDs of the parent folders
+            
+        Returns:
+            dict: Parent folder ID to date folder ID, for the folders that already exist
+        """
+        today_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        found = {}
+
+        def on_listed(request_id, response, exception):
+            if exception is not None:
+                logging.warning(f"Date folder lookup failed for parent folder {request_id}: {exception}")
+                self.reset_on_unauthorized(exception)
+            elif response.get('files'):
+                found[request_id] = response['files'][0]['id']
+
+        try:
+            batch = self.drive_service.new_batch_http_request(callback=on_listed)
+            for parent_folder_id in parent_folder_ids:
+                batch.add(self.date_folder_query(parent_folder_id, today_date), request_id=parent_folder_id)
+            batch.execute()
+        except Exception as e:
+            logging.warning(f"Batch date folder lookup failed: {str(e)}")
+            # create_date_folder covers the folders not found, on a fresh service after a 401
+            self.reset_on_unauthorized(e)
+        return found
+    
+    @retry_transient
     def create_date_folder(self, parent_folder_id):
         """
         Create a folder with today's date in the specified parent folder
@@ -76,12 +161,7 @@ class SavingOnDrive:
             # Get today's date in YYYY-MM-DD format
             today_date = datetime.datetime.now().strftime("%Y-%m-%d")
             # Check if folder already exists
-            query = f"name='{today_date}' and mimeType='application/vnd.google-apps.folder' and '{parent_folder_id}' in parents and trashed=false"
-            results = self.drive_service.files().list(
-                q=query,
-                spaces='drive',
-                fields='files(id, name)'
-            ).execute()
+            results = self.date_folder_query(parent_folder_id, today_date).execute()
             existing_folders = results.get('files', [])
             # If folder already exists, return its ID
             if existing_folders:
@@ -102,9 +182,10 @@ class SavingOnDrive:
             return folder_id
         except Exception as e:
             logging.error(f"Error creating date folder: {str(e)}")
+            self.reset_on_unauthorized(e)
             raise
     
-    @retry(tries=3, delay=2, backoff=2, logger=logging.getLogger(__name__))
+    @retry_transient
     def upload_file(self, file_path, folder_id, file_name=None):
         """
         Upload a file to a specific Google Drive folder
@@ -137,7 +218,8 @@ class SavingOnDrive:
             media = MediaFileUpload(
                 file_path,
                 mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                resumable=True
+                resumable=True,
+                chunksize=UPLOAD_CHUNK_SIZE
             )
             # Execute the upload
             file = self.drive_service.files().create(
@@ -149,11 +231,69 @@ class SavingOnDrive:
             return file.get('id')
         except Exception as e:
             logging.error(f"Upload error: {str(e)}")
+            self.reset_on_unauthorized(e)
             raise
     
+    def copy_file(self, file_id, folder_ids):
+        """
+        Copy an uploaded file into other folders with a single batch request.
+        Only the copies that failed with a retryable status are sent again, so folders
+        that already received the file never get a second copy.
+        
+        Args:
+            file_id: ID of the already uploaded file
+            folder_ids: IDs of the folders to copy the file into
+            
+        Returns:
+            list: List of file IDs of the copies that succeeded
+        """
+        copies = {}
+        pending = list(folder_ids)
+        attempt = 1
+        while pending:
+            if not self.drive_service and not self.authenticate():
+                break
+            errors = {}
+
+            def on_copied(request_id, response, exception):
+                if exception is not None:
+                    errors[request_id] = exception
+                else:
+                    copies[request_id] = response.get('id')
+
+            batch = self.drive_service.new_batch_http_request(callback=on_copied)
+            for folder_id in pending:
+                batch.add(self.drive_service.files().copy(
+                    fileId=file_id,
+                    body={'parents': [folder_id]},
+                    fields='id'
+                ), request_id=folder_id)
+            try:
+                batch.execute()
+            except HttpError as e:
+                # The batch itself was rejected; every copy without a response failed with it
+                errors.update({folder_id: e for folder_id in pending if folder_id not in copies and folder_id not in errors})
+            for error in errors.values():
+                self.reset_on_unauthorized(error)
+            failed = [folder_id for folder_id in pending if folder_id in errors]
+            pending = [folder_id for folder_id in failed if attempt < MAX_ATTEMPTS and is_retryable(errors[folder_id])]
+            for folder_id in failed:
+                if folder_id not in pending:
+                    logging.error(f"Copy error for folder {folder_id}: {errors[folder_id]}")
+            if not pending:
+                break
+            delay = backoff_delay(attempt)
+            logging.warning(f"{len(pending)} copies failed, retrying them in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+        copied = [folder_id for folder_id in folder_ids if folder_id in copies]
+        logging.info(f"File {file_id} copied to folders {copied}")
+        return [copies[folder_id] for folder_id in copied]
+
     def upload_to_multiple_folders(self, file_path, file_name=None):
         """
-        Upload a file to date-based folders within multiple parent folders
+        Upload a file to date-based folders within multiple parent folders.
+        The media is uploaded once; the other folders receive server-side copies.
         
         Args:
             file_path: Path to the file to upload
@@ -165,13 +305,24 @@ class SavingOnDrive:
         if not self.drive_service and not self.authenticate():
             logging.error("Failed to authenticate with Google Drive")
             return []
-        file_ids = []
+        # Existing folders are found in one round-trip; only missing ones go through create_date_folder
+        existing_folders = self.find_date_folders(self.target_folders)
+        date_folder_ids = []
         for parent_folder_id in self.target_folders:
-            date_folder_id = self.create_date_folder(parent_folder_id)
+            date_folder_id = existing_folders.get(parent_folder_id) or self.create_date_folder(parent_folder_id)
             if date_folder_id:
-                file_id = self.upload_file(file_path, date_folder_id, file_name)
-                if file_id:
-                    file_ids.append(file_id)
+                date_folder_ids.append(date_folder_id)
             else:
                 logging.error(f"Failed to create/find date folder in parent folder {parent_folder_id}")
+        if not date_folder_ids:
+            return []
+        file_id = self.upload_file(file_path, date_folder_ids[0], file_name)
+        if not file_id:
+            return []
+        file_ids = [file_id]
+        if len(date_folder_ids) > 1:
+            try:
+                file_ids.extend(self.copy_file(file_id, date_folder_ids[1:]))
+            except Exception as e:
+                logging.error(f"Failed to copy {file_path} to the remaining folders: {str(e)}")
         return file_ids
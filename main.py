@@ -1,18 +1,30 @@
 import asyncio
-import json
 import os
 import tempfile
 import sys
 import subprocess
 import re
 import argparse
+import random
+import glob
+import hashlib
+from importlib import metadata
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List
-import pandas as pd
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from urllib.parse import urlparse
+import orjson
+import aiohttp
+from bs4 import BeautifulSoup
+from xlsxwriter import Workbook
+from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from SavingOnDrive import SavingOnDrive
 import logging
+import time
 from datetime import datetime
-from retry import retry
+try:
+    import uvloop
+except ImportError:  # Not available on Windows; the default loop is used instead
+    uvloop = None
 
 # Set up logging
 logging.basicConfig(
@@ -21,20 +33,293 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+_DIGITS_RE = re.compile(r'\d+')
+_SHEET_NAME_RE = re.compile(r'[\\\/:*?"<>|]')
+
+ITEM_DETAIL_CONCURRENCY = 8
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 20.0
+RETRYABLE_ERRORS = (PlaywrightError, aiohttp.ClientError, asyncio.TimeoutError, OSError)
+# Navigations only wait for domcontentloaded and are followed by a targeted selector wait
+NAVIGATION_TIMEOUT = 30000
+# Upper bound for the selector wait that follows a navigation; ready pages return as soon as it matches
+SELECTOR_TIMEOUT = 30000
+# Item pages are small: the detail block should show up well before SELECTOR_TIMEOUT,
+# and the price gets a short extra wait since it is rendered after the rest
+ITEM_DETAIL_TIMEOUT = 15000
+ITEM_PRICE_TIMEOUT = 8000
+# Default for every other Playwright action in a scraper context
+ACTION_TIMEOUT = 15000
+CDP_PORT = 9222
+# Lean flags for headless CI runners: no GPU/WebGL, no zygote, /tmp instead of /dev/shm
+CHROMIUM_ARGS = [
+    "--no-zygote",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-accelerated-2d-canvas",
+    "--disable-webgl",
+    "--disable-features=IsolateOrigins,site-per-process",
+    "--no-first-run",
+    "--disable-extensions",
+    "--disable-background-networking",
+]
+# Only <img src> attributes are read, so the bytes behind these never need to be fetched
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+# Ad/analytics beacons are never needed and keep pages busy after the content is there
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net", "segment.io", "hotjar.com", "facebook.net")
+EXCEL_COLUMNS = (
+    "Grocery Title",
+    "Delivery Time",
+    "Delivery Fees",
+    "Minimum Order",
+    "URL",
+    "Category",
+    "Category Link",
+    "Sub-Category",
+    "Sub-Category Link",
+    "Items",
+)
+EXCEL_WORKERS = 2
+# Sheets are written one after another in row order, so rows can be flushed to disk as they go;
+# item links stay plain strings instead of counting against the sheet's hyperlink limit
+EXCEL_WORKBOOK_OPTIONS = {"constant_memory": True, "strings_to_urls": False}
+EXCEL_EXECUTOR = ProcessPoolExecutor(max_workers=EXCEL_WORKERS)
+# scraped_progress is journaled per save and only rewritten in full every this many records,
+# or sooner once the journal outgrows this fraction of the full file
+PROGRESS_COMPACT_EVERY = 50
+PROGRESS_COMPACT_RATIO = 0.5
+# Progress saves inside the event loop are coalesced and written at most this often
+PROGRESS_FLUSH_SECONDS = 5
+HTTP_POOL_SIZE = 32
+HTTP_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+# Set DISCOVER_API=1 to log the JSON endpoints the site's frontend calls while scraping
+DISCOVER_API = os.environ.get("DISCOVER_API") == "1"
+API_ENDPOINTS_FILE = os.path.join("output", "api_endpoints.txt")
+# Like STORAGE_STATE_FILE, kept out of output_dir so it is never committed
+ITEM_CACHE_FILE = "item_cache.jsonl"
+# Cookies and local storage from the last run; kept out of output_dir so it is never committed
+STORAGE_STATE_FILE = "browser_state.json"
+# One job (timeout-minutes: 120) plus a prompt re-run; a daily run never reuses yesterday's prices
+ITEM_CACHE_TTL_SECONDS = 3 * 3600
+# Enough idle pages for every item fetch plus the grocery, category and sub-category pages
+PAGE_POOL_SIZE = ITEM_DETAIL_CONCURRENCY + 4
+COMMIT_BATCH_SIZE = 25
+COMMIT_INTERVAL_SECONDS = 300
+COMMIT_SUMMARY_MESSAGES = 5
+PUSH_EVERY_COMMITS = 3
+# ssh remotes keep one master connection open between pushes instead of a new handshake each time
+GIT_SSH_COMMAND = "ssh -o ControlMaster=auto -o ControlPath=~/.ssh/cm-%r@%h:%p -o ControlPersist=600"
+
+VENDOR_CONTAINER_SELECTOR = 'div[data-testid="one-vendor-container"]'
+VENDOR_CARDS_JS = """els => els.map(c => {
+    const a = c.querySelector('a');
+    const h = c.querySelector('a div h2');
+    const d = c.querySelector('div.deliveryInfo');
+    return {title: h ? h.innerText : 'Unknown Grocery', href: a ? a.getAttribute('href') : null, delivery: d ? d.innerText : ''};
+})"""
+
+# Single round-trip readers for element lists
+TEXTS_JS = "els => els.map(el => el.innerText)"
+HREFS_JS = "els => els.map(el => el.getAttribute('href'))"
+TEXT_HREF_PAIRS_JS = "els => els.map(el => [el.innerText, el.getAttribute('href')])"
+
+DELIVERY_FEES_XPATH = '/html/body/div/div/div[1]/div/div[1]/div/div/div/div[2]/div[2]/div[1]/div/div[2]/span[1]'
+MINIMUM_ORDER_XPATH = '/html/body/div/div/div[1]/div/div[1]/div/div/div/div[2]/div[2]/div[1]/div/div[2]/span[3]'
+# Delivery fees, minimum order and the view-all href from one DOM snapshot
+GROCERY_HEADER_JS = """([feesXpath, minimumXpath]) => {
+    const text = xpath => {
+        const node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        return node ? node.innerText : null;
+    };
+    const viewAll = document.querySelector('a[data-testid="view-all-link"]');
+    return {
+        delivery_fees: text(feesXpath),
+        minimum_order: text(minimumXpath),
+        view_all_href: viewAll ? viewAll.getAttribute('href') : null
+    };
+}"""
+VIEW_ALL_LINK_SELECTOR = '//a[@data-testid="view-all-link"]'
+CATEGORY_NAME_SELECTOR = '//span[@data-testid="category-name"]'
+SUB_CATEGORY_SELECTOR = '//div[@data-test="sub-category-container"]//a[@data-testid="subCategory-a"]'
+CATEGORY_LINK_SELECTOR = '//a[@data-testid="category-item-container"]'
+ITEM_DETAIL_READY_SELECTOR = '//div[@class="price"] | //div[@data-testid="item-image"] | //p[@data-testid="item-description"]'
+PAGINATION_LINK_SELECTOR = '//div[@class="sc-104fa483-0 fCcIDQ"]//ul[@class="paginate-wrap"]//li[contains(@class, "paginate-li f-16 f-500")]//a'
+COUNT_JS = "els => els.length"
+SUB_CATEGORY_CSS = 'div[data-test="sub-category-container"] a[data-testid="subCategory-a"]'
+ITEM_CONTAINER_SELECTOR = '//div[@class="category-items-container all-items w-100"]//div[@class="col-8 col-sm-4"]'
+ITEM_LINK_CSS = 'div[class="category-items-container all-items w-100"] div[class="col-8 col-sm-4"] a[data-testid="grocery-item-link-nofollow"]'
+ITEM_LINK_SELECTOR = '//div[@class="category-items-container all-items w-100"]//div[@class="col-8 col-sm-4"]//a[@data-testid="grocery-item-link-nofollow"]'
+ITEM_NAME_SELECTORS = [
+    'div[data-test="item-name"]',
+    'span[data-test="item-name"]',
+    'div[data-testid="product-name"]',
+    'span[data-testid="product-title"]',
+    'div[class*="product-name"]',
+    'span[class*="product-title"]',
+    'h3[class*="product-title"]'
+]
+INVALID_ITEM_NAMES = ['currency', 'kiki', 'market', 'grocery', 'mahboula']
+ITEM_PRICE_SELECTOR = 'div[class="price"] span[class="currency "], span[class*="price"], div[class*="price"] span, div[class*="price"], span[data-testid="price"]'
+ITEM_DETAIL_SELECTORS = {
+    "price": [ITEM_PRICE_SELECTOR],
+    "old_price": [
+        'div[class="price"] p span[class="currency "]',
+        'span[class*="old-price"]',
+        'div[class*="price"] p span',
+    ],
+    "offer": [
+        'div[class="offer"] div[data-testid="offer-tag"] span',
+        'span[class*="offer"]',
+        'div[class*="offer"] span',
+    ],
+    "description": [
+        'div[class="description"] p[data-testid="item-description"]',
+        'div[class*="description"] p',
+        'p[class*="description"]',
+        'div[data-testid="item-description"] p',
+        'section[class*="description"] p',
+    ],
+    "delivery": [
+        'div[data-testid="delivery-tag"] span',
+        'span[class*="delivery-time"]',
+        'div[class*="delivery-info"] span',
+    ],
+    "images": [
+        'div[data-testid="item-image"] img',
+        'img[class*="item-image"]',
+        'img[alt="product image"]',
+        'img[class*="product-image"]',
+    ],
+}
+# Reads every item field in one round-trip; selector lists are tried in priority order
+ITEM_DETAILS_JS = """selectors => {
+    const first = list => {
+        for (const selector of list) {
+            const el = document.querySelector(selector);
+            if (el) return el.innerText;
+        }
+        return null;
+    };
+    const firstNonEmpty = list => {
+        for (const selector of list) {
+            for (const el of document.querySelectorAll(selector)) {
+                const text = el.innerText.trim();
+                if (text && text !== 'N/A') return text;
+            }
+        }
+        return null;
+    };
+    const images = list => {
+        for (const selector of list) {
+            const els = Array.from(document.querySelectorAll(selector));
+            if (els.length) return [...new Set(els.map(img => img.getAttribute('src')).filter(Boolean))];
+        }
+        return [];
+    };
+    return {
+        price: firstNonEmpty(selectors.price),
+        old_price: first(selectors.old_price),
+        offer: first(selectors.offer),
+        description: firstNonEmpty(selectors.description),
+        delivery: first(selectors.delivery),
+        images: images(selectors.images)
+    };
+}"""
+# Returns the first valid name and the href of every item link in one call
+ITEM_CARDS_JS = """(els, [nameSelectors, invalidNames]) => els.map(a => {
+    let name = null;
+    for (const selector of nameSelectors) {
+        const el = a.querySelector(selector);
+        const text = el ? el.innerText.trim() : '';
+        if (text && !invalidNames.some(invalid => text.toLowerCase().includes(invalid))) {
+            name = text;
+            break;
+        }
+    }
+    return {name: name, href: a.getAttribute('href')};
+})"""
+
+def merge_sub_categories(saved, scraped):
+    # extract_sub_categories skips completed sub-categories, so its result is merged into
+    # what is already saved instead of replacing it; a re-scraped name takes the new data
+    merged = {sub_category["sub_category_name"]: sub_category for sub_category in saved}
+    for sub_category in scraped:
+        merged[sub_category["sub_category_name"]] = sub_category
+    return list(merged.values())
+
+def write_progress_files(writes):
+    # Full rewrites go through a temporary file and os.replace so a resume never reads
+    # a half-written file; journal appends are fsynced since they are the only copy
+    for path, payload, append in writes:
+        try:
+            if append:
+                with open(path, 'ab') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+            else:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            logging.error(f"Error writing {path}: {e}")
+
+def git_env():
+    # A GIT_SSH_COMMAND already set by the environment wins; pushes never wait on a prompt
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    env.setdefault("GIT_SSH_COMMAND", GIT_SSH_COMMAND)
+    return env
+
+def progress_digest(payload):
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+def next_retries(retries, error):
+    # Selector/navigation/network failures are worth another attempt; anything else is
+    # a bug or a page that will not change on reload, so give up straight away
+    if isinstance(error, RETRYABLE_ERRORS):
+        return retries - 1
+    logging.error(f"Not retrying after {type(error).__name__}: {error}")
+    return 0
+
+def retry_delay(retries_left):
+    # Exponential backoff with jitter between attempts, none after the last one
+    if retries_left <= 0:
+        return 0
+    attempt = max(0, 2 - retries_left)
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * (1 + random.uniform(0, 0.5))
+
 class TalabatGroceries:
-    def __init__(self, url, browser, main_scraper):
+    def __init__(self, url, browser, main_scraper, context=None):
         self.url = url
         self.base_url = "https://www.talabat.com"
         self.browser = browser
         self.main_scraper = main_scraper
+        # Shared scraper context from MainScraper; pages are opened in it instead of
+        # a fresh context per sub-category or item
+        self.context = context
         print(f"Initialized TalabatGroceries with URL: {self.url}")
 
+    async def new_context(self):
+        return self.context or await new_scraper_context(self.browser)
+
+    async def new_page(self):
+        context = await self.new_context()
+        return await self.main_scraper.acquire_page(context)
+
+    async def wait_for_content(self, page, selector, timeout=SELECTOR_TIMEOUT):
+        try:
+            await page.wait_for_selector(selector, timeout=timeout)
+        except PlaywrightTimeoutError:
+            print(f"Timeout waiting for {selector}, continuing with the current page content")
+
     async def get_general_link(self, page):
         print("Attempting to get general link")
         retries = 3
         while retries > 0:
             try:
-                link_element = await page.wait_for_selector('//a[@data-testid="view-all-link"]', timeout=30000)  # Reduced from 60000
+                link_element = await page.wait_for_selector(VIEW_ALL_LINK_SELECTOR, timeout=SELECTOR_TIMEOUT)
                 if link_element:
                     full_link = self.base_url + await link_element.get_attribute('href')
                     print(f"General link found: {full_link}")
@@ -46,12 +331,12 @@ class TalabatGroceries:
                 print("Timeout waiting for general link")
                 retries -= 1
                 print(f"Retries left: {retries}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(retry_delay(retries))
             except Exception as e:
                 print(f"Error getting general link: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(retry_delay(retries))
         return None
 
     async def get_delivery_fees(self, page):
@@ -59,15 +344,15 @@ class TalabatGroceries:
         retries = 3
         while retries > 0:
             try:
-                delivery_fees_element = await page.query_selector('xpath=/html/body/div/div/div[1]/div/div[1]/div/div/div/div[2]/div[2]/div[1]/div/div[2]/span[1]')
+                delivery_fees_element = await page.query_selector(f'xpath={DELIVERY_FEES_XPATH}')
                 delivery_fees = await delivery_fees_element.inner_text() if delivery_fees_element else "N/A"
                 print(f"Delivery fees: {delivery_fees}")
                 return delivery_fees
             except Exception as e:
                 print(f"Error getting delivery fees: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(retry_delay(retries))
         return "N/A"
 
     async def get_minimum_order(self, page):
@@ -75,15 +360,15 @@ class TalabatGroceries:
         retries = 3
         while retries > 0:
             try:
-                minimum_order_element = await page.query_selector('xpath=/html/body/div/div/div[1]/div/div[1]/div/div/div/div[2]/div[2]/div[1]/div/div[2]/span[3]')
+                minimum_order_element = await page.query_selector(f'xpath={MINIMUM_ORDER_XPATH}')
                 minimum_order = await minimum_order_element.inner_text() if minimum_order_element else "N/A"
                 print(f"Minimum order: {minimum_order}")
                 return minimum_order
             except Exception as e:
                 print(f"Error getting minimum order: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(retry_delay(retries))
         return "N/A"
 
     async def extract_category_names(self, page):
@@ -91,15 +376,14 @@ class TalabatGroceries:
         retries = 3
         while retries > 0:
             try:
-                category_name_elements = await page.query_selector_all('//span[@data-testid="category-name"]')
-                category_names = [await element.inner_text() for element in category_name_elements]
+                category_names = await page.eval_on_selector_all(CATEGORY_NAME_SELECTOR, TEXTS_JS)
                 print(f"Category names extracted: {category_names}")
                 return category_names
             except Exception as e:
                 print(f"Error extracting category names: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(retry_delay(retries))
         return []
 
     async def extract_category_links(self, page):
@@ -107,35 +391,36 @@ class TalabatGroceries:
         retries = 3
         while retries > 0:
             try:
-                category_link_elements = await page.query_selector_all('//a[@data-testid="category-item-container"]')
-                category_links = [self.base_url + await element.get_attribute('href') for element in category_link_elements]
+                category_hrefs = await page.eval_on_selector_all(CATEGORY_LINK_SELECTOR, HREFS_JS)
+                category_links = [self.base_url + href for href in category_hrefs]
                 print(f"Category links extracted: {category_links}")
                 return category_links
             except Exception as e:
                 print(f"Error extracting category links: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(retry_delay(retries))
         return []
 
     async def extract_sub_categories(self, page, category_link, grocery_title, category_name):
         print(f"Attempting to extract sub-categories for: {category_link}")
+        current_progress = self.main_scraper.current_progress["current_progress"]
         retries = 3
         sub_categories = []
-        completed_sub_categories = self.main_scraper.current_progress["current_progress"]["completed_groceries"].get(grocery_title, {}).get("completed sub-categories", [])
-        current_sub_category = self.main_scraper.current_progress["current_progress"].get("current_sub_category")
+        completed_sub_categories = set(current_progress["completed_groceries"].get(grocery_title, {}).get("completed sub-categories", []))
+        current_sub_category = current_progress.get("current_sub_category")
         start_processing = not current_sub_category
     
         while retries > 0:
             try:
-                await page.goto(category_link, timeout=240000)
-                await page.wait_for_load_state("networkidle", timeout=240000)
-                sub_category_elements = await page.query_selector_all('//div[@data-test="sub-category-container"]//a[@data-testid="subCategory-a"]')
-                sub_category_names = [await el.inner_text() for el in sub_category_elements]
-                sub_category_links = [self.base_url + await el.get_attribute('href') for el in sub_category_elements]
-    
-                for idx, (sub_category_name, sub_category_link) in enumerate(zip(sub_category_names, sub_category_links)):
-                    if sub_category_name in completed_sub_categories:
+                sub_category_pairs = await self.load_sub_category_pairs(page, category_link)
+                sub_category_names = [name for name, _ in sub_category_pairs]
+                sub_category_links = [self.base_url + href for _, href in sub_category_pairs]
+    
+                # Sub-categories finished by an earlier attempt of this loop are not scraped again
+                scraped_sub_categories = {s["sub_category_name"] for s in sub_categories}
+                for sub_category_name, sub_category_link in zip(sub_category_names, sub_category_links):
+                    if sub_category_name in completed_sub_categories or sub_category_name in scraped_sub_categories:
                         print(f"    Skipping completed sub-category: {sub_category_name}")
                         continue
     
@@ -149,10 +434,8 @@ class TalabatGroceries:
     
                     print(f"    Processing sub-category: {sub_category_name}")
                     print(f"    Sub-category link: {sub_category_link}")
-                    self.main_scraper.current_progress["current_progress"]["current_sub_category"] = sub_category_name
-                    self.main_scraper.current_progress["current_progress"]["current_category"] = category_name
-                    self.main_scraper.scraped_progress["current_progress"]["current_sub_category"] = sub_category_name
-                    self.main_scraper.scraped_progress["current_progress"]["current_category"] = category_name
+                    current_progress["current_sub_category"] = sub_category_name
+                    current_progress["current_category"] = category_name
                     self.main_scraper.save_current_progress()
                     self.main_scraper.save_scraped_progress()
                     items = await self.extract_all_items_from_sub_category(sub_category_link)
@@ -163,64 +446,58 @@ class TalabatGroceries:
                     }
                     sub_categories.append(sub_category_data)
     
-                    completed_groceries = self.main_scraper.current_progress["current_progress"]["completed_groceries"].setdefault(grocery_title, {})
+                    completed_groceries = current_progress["completed_groceries"].setdefault(grocery_title, {})
                     completed_groceries.setdefault("completed sub-categories", []).append(sub_category_name)
-                    self.main_scraper.current_progress["current_progress"]["completed_groceries"][grocery_title] = completed_groceries
-                    self.main_scraper.scraped_progress["current_progress"]["completed_groceries"] = self.main_scraper.current_progress["current_progress"]["completed_groceries"]
+                    current_progress["completed_groceries"][grocery_title] = completed_groceries
                     self.main_scraper.save_current_progress()
                     self.main_scraper.save_scraped_progress()
-                    self.main_scraper.commit_progress(f"Processed sub-category {sub_category_name} for {grocery_title} in {category_name}")
+                    await self.main_scraper.commit_progress(f"Processed sub-category {sub_category_name} for {grocery_title} in {category_name}")
     
-                if all(sub_cat_name in completed_sub_categories + [s["sub_category_name"] for s in sub_categories] for sub_cat_name in sub_category_names):
-                    completed_groceries = self.main_scraper.current_progress["current_progress"]["completed_groceries"].setdefault(grocery_title, {})
+                done_sub_categories = completed_sub_categories.union(s["sub_category_name"] for s in sub_categories)
+                if all(sub_cat_name in done_sub_categories for sub_cat_name in sub_category_names):
+                    completed_groceries = current_progress["completed_groceries"].setdefault(grocery_title, {})
                     completed_groceries.setdefault("completed categories", []).append(category_name)
-                    self.main_scraper.current_progress["current_progress"]["completed_groceries"][grocery_title] = completed_groceries
-                    self.main_scraper.scraped_progress["current_progress"]["completed_groceries"] = self.main_scraper.current_progress["current_progress"]["completed_groceries"]
-                    self.main_scraper.current_progress["current_progress"]["current_sub_category"] = None
-                    self.main_scraper.scraped_progress["current_progress"]["current_sub_category"] = None
-                    self.main_scraper.current_progress["current_progress"]["current_category"] = None
-                    self.main_scraper.scraped_progress["current_progress"]["current_category"] = None
+                    current_progress["completed_groceries"][grocery_title] = completed_groceries
+                    current_progress["current_sub_category"] = None
+                    current_progress["current_category"] = None
                     self.main_scraper.save_current_progress()
                     self.main_scraper.save_scraped_progress()
-                    self.main_scraper.commit_progress(f"Completed category {category_name} for {grocery_title}")
+                    await self.main_scraper.commit_progress(f"Completed category {category_name} for {grocery_title}")
     
-                area_name = self.main_scraper.current_progress["current_progress"]["area_name"]
+                area_name = current_progress["area_name"]
                 if area_name:
                     grocery_data = self.main_scraper.scraped_progress["all_results"].setdefault(area_name, {}).setdefault(grocery_title, {
                         "grocery_link": self.url,
                         "delivery_time": "N/A",
                         "grocery_details": {"delivery_fees": "N/A", "minimum_order": "N/A", "categories": {}}
                     })
-                    grocery_data["grocery_details"]["categories"][category_name] = {
-                        "category_link": category_link,
-                        "sub_categories": sub_categories
-                    }
-                    self.main_scraper.scraped_progress["all_results"][area_name][grocery_title] = grocery_data
+                    # grocery_data is the live dict inside all_results, so updating it in place is enough
+                    category_data = grocery_data["grocery_details"]["categories"].setdefault(category_name, {"sub_categories": []})
+                    category_data["category_link"] = category_link
+                    category_data["sub_categories"] = merge_sub_categories(category_data.get("sub_categories", []), sub_categories)
                     self.main_scraper.save_scraped_progress()
-                    self.main_scraper.commit_progress(f"Updated results for {category_name} in {grocery_title}")
+                    await self.main_scraper.commit_progress(f"Updated results for {category_name} in {grocery_title}")
     
                 return sub_categories
             except Exception as e:
                 print(f"Error extracting sub-categories: {e}")
                 logging.error(f"Error extracting sub-categories: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(retry_delay(retries))
         return sub_categories
     
     async def verify_sub_categories(self, page, category_link, grocery_title, category_name):
         print(f"Verifying sub-categories for category: {category_name} at {category_link}")
         retries = 3
         missing_sub_categories = []
-        completed_sub_categories = self.main_scraper.current_progress["current_progress"]["completed_groceries"].get(grocery_title, {}).get("completed sub-categories", [])
+        completed_sub_categories = set(self.main_scraper.current_progress["current_progress"]["completed_groceries"].get(grocery_title, {}).get("completed sub-categories", []))
 
         while retries > 0:
             try:
-                await page.goto(category_link, timeout=240000)
-                await page.wait_for_load_state("networkidle", timeout=240000)
-                sub_category_elements = await page.query_selector_all('//div[@data-test="sub-category-container"]//a[@data-testid="subCategory-a"]')
-                sub_category_names = [await el.inner_text() for el in sub_category_elements]
-                sub_category_links = [self.base_url + await el.get_attribute('href') for el in sub_category_elements]
+                sub_category_pairs = await self.load_sub_category_pairs(page, category_link)
+                sub_category_names = [name for name, _ in sub_category_pairs]
+                sub_category_links = [self.base_url + href for _, href in sub_category_pairs]
 
                 for name, link in zip(sub_category_names, sub_category_links):
                     if name not in completed_sub_categories:
@@ -229,153 +506,83 @@ class TalabatGroceries:
                 return missing_sub_categories
             except Exception as e:
                 print(f"Error verifying sub-categories for {category_link}: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(retry_delay(retries))
         return missing_sub_categories
 
-    async def extract_item_details(self, item_link):
+    async def extract_item_details(self, item_link, context=None):
+        # Items recur across sub-categories and resumed runs; serve those from the item
+        # cache and let concurrent requests for the same link share one navigation
+        cached = self.main_scraper.get_cached_item(item_link)
+        if cached:
+            print(f"Using cached item details for link: {item_link}")
+            return cached
+        in_flight = self.main_scraper.item_fetches
+        task = in_flight.get(item_link)
+        if task is None:
+            task = asyncio.ensure_future(self.load_item_details(item_link, context))
+            in_flight[item_link] = task
+            task.add_done_callback(lambda _: in_flight.pop(item_link, None))
+        # Shielded so a cancelled caller (a dropped page fetch) leaves the fetch running for the others
+        return await asyncio.shield(task)
+
+    async def load_item_details(self, item_link, context=None):
+        # Every caller sharing the fetch gets the same result, placeholder included
+        item_details = await self.fetch_item_details(item_link, context)
+        if item_details:
+            self.main_scraper.cache_item(item_link, item_details)
+            return item_details
+        print(f"Failed to extract details for {item_link} after all retries")
+        return {
+            "item_price": "N/A",
+            "item_old_price": None,
+            "item_offer": None,
+            "item_description": "N/A",
+            "item_delivery_time_range": "N/A",
+            "item_images": []
+        }
+
+    async def fetch_item_details(self, item_link, context=None):
         print(f"Attempting to extract item details for link: {item_link}")
         retries = 3
         while retries > 0:
+            # Reset every attempt so cleanup never sees the page an earlier attempt already returned
+            page = None
+            owns_context = False
             try:
-                context = await self.browser.new_context()
-                page = await context.new_page()
-    
-                await page.goto(item_link, timeout=240000, wait_until="domcontentloaded")
-                critical_selector = '//div[@class="price"] | //div[@data-testid="item-image"] | //p[@data-testid="item-description"]'
-                await page.wait_for_selector(critical_selector, timeout=30000)
-    
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await page.wait_for_timeout(2000)
-    
-                price_selectors = [
-                    '//div[@class="price"]//span[@class="currency "]',
-                    '//span[contains(@class, "price")]',
-                    '//div[contains(@class, "price")]//span',
-                    '//div[contains(@class, "price")]//text()',
-                    '//span[@data-testid="price"]',
-                ]
-                item_price = "N/A"
-                for selector in price_selectors:
-                    price_elements = await page.query_selector_all(selector)
-                    for element in price_elements:
-                        text = await element.inner_text()
-                        if text.strip() and text != "N/A":
-                            item_price = text.strip()
-                            break
-                    if item_price != "N/A":
-                        break
-    
-                old_price_selectors = [
-                    '//div[@class="price"]//p//span[@class="currency "]',
-                    '//span[contains(@class, "old-price")]',
-                    '//div[contains(@class, "price")]//p//span',
-                ]
-                item_old_price = None
-                for selector in old_price_selectors:
-                    old_price_element = await page.query_selector(selector)
-                    if old_price_element:
-                        item_old_price = await old_price_element.inner_text()
-                        print(f"Item old price: {item_old_price}")
-                        break
-                if not item_old_price:
-                    print("Item old price: None")
-    
-                offer_selectors = [
-                    '//div[@class="offer"]//div[@data-testid="offer-tag"]//span',
-                    '//span[contains(@class, "offer")]',
-                    '//div[contains(@class, "offer")]//span',
-                ]
-                item_offer = None
-                for selector in offer_selectors:
-                    offer_element = await page.query_selector(selector)
-                    if offer_element:
-                        item_offer = await offer_element.inner_text()
-                        print(f"Item offer: {item_offer}")
-                        break
-                if not item_offer:
-                    print("Item offer: None")
-    
-                desc_selectors = [
-                    '//div[@class="description"]//p[@data-testid="item-description"]',
-                    '//div[contains(@class, "description")]//p',
-                    '//p[contains(@class, "description")]',
-                    '//div[@data-testid="item-description"]//p',
-                    '//section[contains(@class, "description")]//p',
-                ]
-                item_description = "N/A"
-                for selector in desc_selectors:
-                    desc_element = await page.query_selector(selector)
-                    if desc_element:
-                        item_description = await desc_element.inner_text()
-                        if item_description.strip():
-                            break
-                if item_description == "N/A":
-                    print("Item description: N/A")
-    
-                delivery_time_selectors = [
-                    '//div[@data-testid="delivery-tag"]//span',
-                    '//span[contains(@class, "delivery-time")]',
-                    '//div[contains(@class, "delivery-info")]//span',
-                ]
-                delivery_time = "N/A"
-                for selector in delivery_time_selectors:
-                    delivery_time_element = await page.query_selector(selector)
-                    if delivery_time_element:
-                        delivery_time = await delivery_time_element.inner_text()
-                        break
-    
-                image_selectors = [
-                    '//div[@data-testid="item-image"]//img',
-                    '//img[contains(@class, "item-image")]',
-                    '//img[@alt="product image"]',
-                    '//img[contains(@class, "product-image")]',
-                ]
-                item_images = []
-                for selector in image_selectors:
-                    item_image_elements = await page.query_selector_all(selector)
-                    if item_image_elements:
-                        item_images = [await img.get_attribute('src') for img in item_image_elements if await img.get_attribute('src')]
-                        break
-    
-                if item_price == "N/A" and item_description == "N/A" and not item_images:
+                item_context = context or await self.new_context()
+                owns_context = item_context is not context and item_context is not self.context
+                details = await self.fetch_item_details_html(item_context, item_link)
+                if details:
+                    return details
+                page = await self.main_scraper.acquire_page(item_context)
+    
+                await page.goto(item_link, timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+                await page.wait_for_selector(ITEM_DETAIL_READY_SELECTOR, timeout=ITEM_DETAIL_TIMEOUT)
+                await self.wait_for_content(page, ITEM_PRICE_SELECTOR, timeout=ITEM_PRICE_TIMEOUT)
+    
+                details = await page.evaluate(ITEM_DETAILS_JS, ITEM_DETAIL_SELECTORS)
+                if not details["price"] and not details["description"] and not details["images"]:
                     print("Critical data missing, refreshing page...")
-                    await page.reload(timeout=30000, wait_until="domcontentloaded")
-                    await page.wait_for_selector(critical_selector, timeout=30000)
-                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await page.wait_for_timeout(2000)
-    
-                    for selector in price_selectors:
-                        price_elements = await page.query_selector_all(selector)
-                        for element in price_elements:
-                            text = await element.inner_text()
-                            if text.strip() and text != "N/A":
-                                item_price = text.strip()
-                                break
-                        if item_price != "N/A":
-                            break
-    
-                    for selector in desc_selectors:
-                        desc_element = await page.query_selector(selector)
-                        if desc_element:
-                            item_description = await desc_element.inner_text()
-                            if item_description.strip():
-                                break
-    
-                    for selector in image_selectors:
-                        item_image_elements = await page.query_selector_all(selector)
-                        if item_image_elements:
-                            item_images = [await img.get_attribute('src') for img in item_image_elements if await img.get_attribute('src')]
-                            break
-    
+                    await page.reload(timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+                    await page.wait_for_selector(ITEM_DETAIL_READY_SELECTOR, timeout=ITEM_DETAIL_TIMEOUT)
+                    await self.wait_for_content(page, ITEM_PRICE_SELECTOR, timeout=ITEM_PRICE_TIMEOUT)
+                    details = await page.evaluate(ITEM_DETAILS_JS, ITEM_DETAIL_SELECTORS)
+
+                item_price = details["price"] or "N/A"
+                item_old_price = details["old_price"]
+                item_offer = details["offer"]
+                item_description = details["description"] or "N/A"
+                delivery_time = details["delivery"] or "N/A"
+                item_images = details["images"]
+                print(f"Item old price: {item_old_price}")
+                print(f"Item offer: {item_offer}")
                 print(f"Item price: {item_price}")
                 print(f"Item description: {item_description}")
                 print(f"Item images: {item_images}")
                 print(f"Delivery time range: {delivery_time}")
     
-                await page.close()
-                await context.close()
                 return {
                     "item_price": item_price,
                     "item_old_price": item_old_price,
@@ -386,32 +593,29 @@ class TalabatGroceries:
                 }
             except Exception as e:
                 print(f"Error extracting item details for {item_link}: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                if 'page' in locals():
-                    await page.close()
-                if 'context' in locals():
-                    await context.close()
-                await asyncio.sleep(5)
-        print(f"Failed to extract details for {item_link} after all retries")
-        return {
-            "item_price": "N/A",
-            "item_old_price": None,
-            "item_offer": None,
-            "item_description": "N/A",
-            "item_delivery_time_range": "N/A",
-            "item_images": []
-        }
+            finally:
+                if page is not None:
+                    await self.main_scraper.release_page(page)
+                if owns_context:
+                    await item_context.close()
+            await asyncio.sleep(retry_delay(retries))
+        return None
     
     async def extract_all_items_from_sub_category(self, sub_category_link):
         print(f"Attempting to extract all items from sub-category: {sub_category_link}")
         retries = 3
         while retries > 0:
+            # Reset every attempt so cleanup never touches what an earlier attempt already released
+            context = None
+            sub_page = None
+            page_fetches = []
             try:
-                context = await self.browser.new_context()
-                sub_page = await context.new_page()
-                await sub_page.goto(sub_category_link, timeout=240000, wait_until="domcontentloaded")
-                await sub_page.wait_for_selector('//div[@class="category-items-container all-items w-100"]//div[@class="col-8 col-sm-4"]', timeout=30000)
+                context = await self.new_context()
+                sub_page = await self.main_scraper.acquire_page(context)
+                await sub_page.goto(sub_category_link, timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+                await sub_page.wait_for_selector(ITEM_CONTAINER_SELECTOR, timeout=SELECTOR_TIMEOUT)
     
                 html_content = await sub_page.content()
                 html_filename = f"sub_category_{sub_category_link.split('/')[-1].replace('?aid=37', '')}.html"
@@ -419,96 +623,225 @@ class TalabatGroceries:
                     f.write(html_content)
                 print(f"      Saved sub-category HTML to {html_filename} for debugging")
     
-                pagination_element = await sub_page.query_selector('//div[@class="sc-104fa483-0 fCcIDQ"]//ul[@class="paginate-wrap"]')
-                total_pages = 1
-                if pagination_element:
-                    page_numbers = await pagination_element.query_selector_all('//li[contains(@class, "paginate-li f-16 f-500")]//a')
-                    total_pages = len(page_numbers) if page_numbers else 1
+                # Page links are counted in the browser in one call instead of fetching every handle
+                total_pages = await sub_page.eval_on_selector_all(PAGINATION_LINK_SELECTOR, COUNT_JS) or 1
                 print(f"      Found {total_pages} pages in this sub-category")
     
-                items = []
+                async def fetch_item(i, item_card):
+                    async with self.main_scraper.item_semaphore:
+                        item_name = item_card["name"]
+                        if not item_name:
+                            item_name = f"Unknown Item {i+1}"
+                            print(f"        No valid item name found, using default: {item_name}")
+                        else:
+                            print(f"        Item name: {item_name}")
+                        item_link = self.base_url + item_card["href"]
+                        print(f"        Item link: {item_link}")
+                        item_details = await self.extract_item_details(item_link, context)
+                        return {
+                            "item_name": item_name.strip(),
+                            "item_link": item_link,
+                            **item_details
+                        }
+
+                # Pages 2..N are fetched as plain HTML all at once; any that come back
+                # without item cards are rendered in sub_page one by one below
+                page_urls = [f"{sub_category_link}&page={page_number}" for page_number in range(2, total_pages + 1)]
+                prefetched_cards = await asyncio.gather(*[self.fetch_item_cards(context, page_url) for page_url in page_urls])
+
+                # Each page's item fetches start as soon as its cards are known, so they overlap
+                # with rendering the pages that still need the browser
                 for page_number in range(1, total_pages + 1):
                     print(f"      Processing page {page_number} of {total_pages}")
-                    page_url = f"{sub_category_link}&page={page_number}" if page_number > 1 else sub_category_link
-                    await sub_page.goto(page_url, timeout=240000, wait_until="domcontentloaded")
-                    await sub_page.wait_for_selector('//div[@class="category-items-container all-items w-100"]//div[@class="col-8 col-sm-4"]', timeout=30000)
-    
-                    item_elements = await sub_page.query_selector_all('//div[@class="category-items-container all-items w-100"]//div[@class="col-8 col-sm-4"]//a[@data-testid="grocery-item-link-nofollow"]')
-                    print(f"        Found {len(item_elements)} items on page {page_number}")
-    
-                    for i, element in enumerate(item_elements):
-                        try:
-                            name_selectors = [
-                                'div[data-test="item-name"]',
-                                'span[data-test="item-name"]',
-                                'div[data-testid="product-name"]',
-                                'span[data-testid="product-title"]',
-                                'div[class*="product-name"]',
-                                'span[class*="product-title"]',
-                                'h3[class*="product-title"]'
-                            ]
-                            item_name = None
-                            for selector in name_selectors:
-                                item_name_element = await element.query_selector(selector)
-                                if item_name_element:
-                                    item_name = await item_name_element.inner_text()
-                                    if item_name and item_name.strip():
-                                        invalid_names = ['currency', 'kiki', 'market', 'grocery', 'mahboula']
-                                        if not any(invalid.lower() in item_name.lower() for invalid in invalid_names):
-                                            print(f"        Item name: {item_name}")
-                                            break
-                                        else:
-                                            print(f"        Selector '{selector}' found invalid name: {item_name} (matched: {[invalid for invalid in invalid_names if invalid.lower() in item_name.lower()]})")
-                                            item_name = None
-                                    else:
-                                        print(f"        Selector '{selector}' found empty or invalid name")
-                                else:
-                                    print(f"        Selector '{selector}' not found")
-    
-                            if not item_name or not item_name.strip():
-                                item_name = f"Unknown Item {i+1}"
-                                print(f"        No valid item name found, using default: {item_name}")
-    
-                            item_link = self.base_url + await element.get_attribute('href')
-                            print(f"        Item link: {item_link}")
-    
-                            item_details = await self.extract_item_details(item_link)
-                            items.append({
-                                "item_name": item_name.strip(),
-                                "item_link": item_link,
-                                **item_details
-                            })
-    
-                            await asyncio.sleep(1)
-                        except Exception as e:
-                            print(f"        Error processing item {i+1}: {e}")
-                            logging.error(f"Error processing item {i+1} in {sub_category_link}: {e}")
-                await sub_page.close()
-                await context.close()
+                    if page_number == 1:
+                        # The first page is already rendered in sub_page
+                        item_cards = await sub_page.eval_on_selector_all(ITEM_LINK_SELECTOR, ITEM_CARDS_JS, [ITEM_NAME_SELECTORS, INVALID_ITEM_NAMES])
+                    else:
+                        item_cards = prefetched_cards[page_number - 2] or await self.render_item_cards(sub_page, page_urls[page_number - 2])
+                    print(f"        Found {len(item_cards)} items on page {page_number}")
+                    page_fetches.append(asyncio.gather(*[fetch_item(i, item_card) for i, item_card in enumerate(item_cards)], return_exceptions=True))
+
+                items = []
+                for results in await asyncio.gather(*page_fetches):
+                    for i, result in enumerate(results):
+                        if isinstance(result, Exception):
+                            print(f"        Error processing item {i+1}: {result}")
+                            logging.error(f"Error processing item {i+1} in {sub_category_link}: {result}")
+                        else:
+                            items.append(result)
                 return items
             except Exception as e:
                 print(f"Error extracting items from sub-category {sub_category_link}: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                if 'sub_page' in locals():
-                    await sub_page.close()
-                if 'context' in locals():
+            finally:
+                # Item fetches still running after a failure are dropped before the retry
+                for page_fetch in page_fetches:
+                    page_fetch.cancel()
+                if sub_page is not None:
+                    await self.main_scraper.release_page(sub_page)
+                if context is not None and context is not self.context:
                     await context.close()
-                await asyncio.sleep(5)
+            await asyncio.sleep(retry_delay(retries))
         return []
 
+    def parse_item_details(self, html):
+        # Mirrors ITEM_DETAILS_JS on server-rendered HTML
+        soup = BeautifulSoup(html, "html.parser")
+        details = self.parse_product_json_ld(soup)
+        if details:
+            return details
+
+        def first(selectors):
+            for selector in selectors:
+                element = soup.select_one(selector)
+                if element:
+                    return element.get_text(strip=True)
+            return None
+
+        def first_non_empty(selectors):
+            for selector in selectors:
+                for element in soup.select(selector):
+                    text = element.get_text(strip=True)
+                    if text and text != "N/A":
+                        return text
+            return None
+
+        images = []
+        for selector in ITEM_DETAIL_SELECTORS["images"]:
+            elements = soup.select(selector)
+            if elements:
+                images = list(dict.fromkeys(img.get('src') for img in elements if img.get('src')))
+                break
+        return {
+            "item_price": first_non_empty(ITEM_DETAIL_SELECTORS["price"]) or "N/A",
+            "item_old_price": first(ITEM_DETAIL_SELECTORS["old_price"]),
+            "item_offer": first(ITEM_DETAIL_SELECTORS["offer"]),
+            "item_description": first_non_empty(ITEM_DETAIL_SELECTORS["description"]) or "N/A",
+            "item_delivery_time_range": first(ITEM_DETAIL_SELECTORS["delivery"]) or "N/A",
+            "item_images": images
+        }
+
+    def parse_product_json_ld(self, soup):
+        # Product pages that embed schema.org JSON-LD carry price, description and
+        # images directly, so the selector probes below are skipped for them
+        for script in soup.find_all("script", type="application/ld+json"):
+            try:
+                data = orjson.loads(script.string or "")
+            except orjson.JSONDecodeError:
+                continue
+            candidates = data if isinstance(data, list) else data.get("@graph", [data]) if isinstance(data, dict) else []
+            for product in candidates:
+                if not isinstance(product, dict) or product.get("@type") != "Product":
+                    continue
+                offers = product.get("offers") or {}
+                if isinstance(offers, list):
+                    offers = offers[0] if offers else {}
+                price = offers.get("price")
+                if price is None or not product.get("description"):
+                    continue
+                currency = offers.get("priceCurrency")
+                images = product.get("image") or []
+                if isinstance(images, str):
+                    images = [images]
+                return {
+                    "item_price": f"{currency} {price}" if currency else str(price),
+                    "item_old_price": None,
+                    "item_offer": None,
+                    "item_description": product["description"],
+                    "item_delivery_time_range": "N/A",
+                    "item_images": list(dict.fromkeys(images))
+                }
+        return None
+
+    async def fetch_item_details_html(self, context, item_link):
+        # Item pages are tried as plain HTML first; the browser only renders the
+        # page when the price and description are not in the server response
+        try:
+            session = await self.main_scraper.get_http_session(context)
+            async with session.get(item_link) as response:
+                if response.status != 200:
+                    return None
+                html = await response.text()
+            details = self.parse_item_details(html)
+        except Exception as e:
+            print(f"Error fetching {item_link} directly: {e}")
+            return None
+        if details["item_price"] == "N/A" or details["item_description"] == "N/A":
+            return None
+        print(f"Item price: {details['item_price']}")
+        print(f"Item description: {details['item_description']}")
+        print(f"Item images: {details['item_images']}")
+        return details
+
+    def parse_item_cards(self, html):
+        soup = BeautifulSoup(html, "html.parser")
+        item_cards = []
+        for link in soup.select(ITEM_LINK_CSS):
+            name = None
+            for selector in ITEM_NAME_SELECTORS:
+                element = link.select_one(selector)
+                text = element.get_text(strip=True) if element else ""
+                if text and not any(invalid in text.lower() for invalid in INVALID_ITEM_NAMES):
+                    name = text
+                    break
+            if link.get('href'):
+                item_cards.append({"name": name, "href": link.get('href')})
+        return item_cards
+
+    async def load_sub_category_pairs(self, page, category_link):
+        # The sub-category bar is tried from the server HTML first; the page is only
+        # rendered when the plain response has no sub-category links
+        try:
+            session = await self.main_scraper.get_http_session(page.context)
+            async with session.get(category_link) as response:
+                if response.status == 200:
+                    soup = BeautifulSoup(await response.text(), "html.parser")
+                    sub_category_pairs = [[link.get_text().strip(), link.get('href')] for link in soup.select(SUB_CATEGORY_CSS) if link.get('href')]
+                    if sub_category_pairs:
+                        return sub_category_pairs
+        except Exception as e:
+            print(f"    Error fetching {category_link} directly: {e}")
+        await page.goto(category_link, timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+        await self.wait_for_content(page, SUB_CATEGORY_SELECTOR)
+        return await page.eval_on_selector_all(SUB_CATEGORY_SELECTOR, TEXT_HREF_PAIRS_JS)
+
+    async def fetch_item_cards(self, context, page_url):
+        # Pagination pages are fetched with the pooled HTTP session (browser cookies, no
+        # rendering); an empty result means the items are not in the server HTML
+        try:
+            session = await self.main_scraper.get_http_session(context)
+            async with session.get(page_url) as response:
+                if response.status == 200:
+                    return self.parse_item_cards(await response.text())
+        except Exception as e:
+            print(f"        Error fetching {page_url} directly: {e}")
+        return []
+
+    async def render_item_cards(self, sub_page, page_url):
+        print(f"        Falling back to page navigation for {page_url}")
+        await sub_page.goto(page_url, timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+        await sub_page.wait_for_selector(ITEM_CONTAINER_SELECTOR, timeout=SELECTOR_TIMEOUT)
+        return await sub_page.eval_on_selector_all(ITEM_LINK_SELECTOR, ITEM_CARDS_JS, [ITEM_NAME_SELECTORS, INVALID_ITEM_NAMES])
+
     async def extract_categories(self, page):
         print(f"Processing grocery: {self.url}")
         retries = 3
         while retries > 0:
+            category_page = None
             try:
-                await page.goto(self.url, timeout=240000)
-                await page.wait_for_load_state("networkidle", timeout=240000)
+                await page.goto(self.url, timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+                await self.wait_for_content(page, VIEW_ALL_LINK_SELECTOR)
                 print("Page loaded successfully")
 
-                delivery_fees = await self.get_delivery_fees(page)
-                minimum_order = await self.get_minimum_order(page)
-                view_all_link = await self.get_general_link(page)
+                header = await page.evaluate(GROCERY_HEADER_JS, [DELIVERY_FEES_XPATH, MINIMUM_ORDER_XPATH])
+                delivery_fees = header["delivery_fees"] or "N/A"
+                minimum_order = header["minimum_order"] or "N/A"
+                if header["view_all_href"]:
+                    view_all_link = self.base_url + header["view_all_href"]
+                    print(f"General link found: {view_all_link}")
+                else:
+                    view_all_link = await self.get_general_link(page)
 
                 print(f"  Delivery fees: {delivery_fees}")
                 print(f"  Minimum order: {minimum_order}")
@@ -516,9 +849,9 @@ class TalabatGroceries:
                 categories_data = {}
                 if view_all_link:
                     print(f"  Navigating to view all link: {view_all_link}")
-                    category_page = await self.browser.new_page()
-                    await category_page.goto(view_all_link, timeout=240000)
-                    await category_page.wait_for_load_state("networkidle", timeout=240000)
+                    category_page = await self.new_page()
+                    await category_page.goto(view_all_link, timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+                    await self.wait_for_content(category_page, CATEGORY_NAME_SELECTOR)
 
                     category_names = await self.extract_category_names(category_page)
                     category_links = await self.extract_category_links(category_page)
@@ -531,7 +864,6 @@ class TalabatGroceries:
                             "category_link": link,
                             "sub_categories": []
                         }
-                    await category_page.close()
 
                 return {
                     "delivery_fees": delivery_fees,
@@ -540,9 +872,12 @@ class TalabatGroceries:
                 }
             except Exception as e:
                 print(f"Error extracting categories: {e}")
-                retries -= 1
+                retries = next_retries(retries, e)
                 print(f"Retries left: {retries}")
-                await asyncio.sleep(5)
+            finally:
+                if category_page is not None:
+                    await self.main_scraper.release_page(category_page)
+            await asyncio.sleep(retry_delay(retries))
         return {"error": "Failed to extract categories after multiple attempts"}
 
 class MainScraper:
@@ -555,6 +890,24 @@ class MainScraper:
         os.makedirs(self.output_dir, exist_ok=True)
         self.blob_service_client = None  # No Azure Blob Storage client
         self.container_name = "scraper-progress"
+        self._uncommitted_messages = []
+        self._last_commit_time = 0.0
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._journal_base_bytes = 0
+        self._journal_base_file = None
+        # last_updated of the full file the journal was started against
+        self._journal_base_stamp = None
+        self._commit_queue = None
+        self._commit_worker = None
+        self._commits_since_push = 0
+        self._dirty_progress = set()
+        self._dirty_groceries = set()
+        self._written_digests = {}
+        self._progress_flusher = None
+        # Writes collected by the in-loop flush and handed to a worker thread; None writes directly
+        self._progress_writes = None
+        self._progress_io_lock = asyncio.Lock()
         # Initialize current_progress with default structure to avoid AttributeError
         self.current_progress = {
             "completed_areas": [],
@@ -574,8 +927,21 @@ class MainScraper:
         }
         self.current_progress = self.load_current_progress()  # Load progress after initializing
         self.scraped_progress = self.load_scraped_progress()
-        self.ensure_playwright_browsers()
-        self.commit_progress("Initialized progress files at scraper start")
+        # Both files carry the same cursor; one dict backs both so it is only ever updated once
+        self.scraped_progress["current_progress"] = self.current_progress["current_progress"]
+        self.item_cache = self.load_item_cache()
+        self.item_fetches = {}
+        # Shared by every sub-category so item pages stay bounded however callers overlap
+        self.item_semaphore = asyncio.Semaphore(ITEM_DETAIL_CONCURRENCY)
+        self.http_session = None
+        # Idle pages per context, reset to about:blank and handed out again instead of reopened
+        self.page_pool = {}
+        self.excel_tasks = []
+
+    async def setup(self):
+        # Both block for seconds (a browser download, a git push), so they run off the event loop
+        await asyncio.to_thread(self.ensure_playwright_browsers)
+        await self.push_progress("Initialized progress files at scraper start", include_output=True)
 
     def load_current_progress(self) -> Dict:
         default_progress = {
@@ -599,8 +965,8 @@ class MainScraper:
             area_name = self.current_progress["current_progress"].get("area_name") or "default"
             progress_file = f"current_progress_{area_name}.json"
             if os.path.exists(progress_file):
-                with open(progress_file, 'r', encoding='utf-8') as f:
-                    progress = json.load(f)
+                with open(progress_file, 'rb') as f:
+                    progress = orjson.loads(f.read())
                 if "current_progress" not in progress:
                     progress["current_progress"] = default_progress["current_progress"]
                 current = progress["current_progress"]
@@ -613,10 +979,10 @@ class MainScraper:
                 current.setdefault("current_category", None)
                 current.setdefault("current_sub_category", None)
                 current.setdefault("total_groceries", 0)
-                current["processed_groceries"] = list(set(current["processed_groceries"]))
-                progress["completed_areas"] = list(set(progress.get("completed_areas", [])))
+                current["processed_groceries"] = list(dict.fromkeys(current["processed_groceries"]))
+                progress["completed_areas"] = list(dict.fromkeys(progress.get("completed_areas", [])))
                 progress["last_updated"] = progress.get("last_updated", datetime.now().isoformat())
-                logging.info(f"Loaded {progress_file} from local storage")
+                logging.info(f"Loaded {progress_file} ({os.path.getsize(progress_file)} bytes) from local storage")
                 return progress
             else:
                 logging.info(f"{progress_file} not found, returning default progress")
@@ -626,19 +992,35 @@ class MainScraper:
             return default_progress
 
     def ensure_playwright_browsers(self):
+        # The marker lives inside the browser cache, so wiping the cache also forces a reinstall
+        browsers_path = os.environ.get("PLAYWRIGHT_BROWSERS_PATH") or os.path.join(os.path.expanduser("~"), ".cache", "ms-playwright")
+        marker_file = os.path.join(browsers_path, f".chromium-installed-{metadata.version('playwright')}")
+        if os.path.exists(marker_file):
+            logging.info(f"Chromium already installed for Playwright, skipping install ({marker_file})")
+            return
         subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=True)
+        try:
+            open(marker_file, 'w').close()
+        except OSError as e:
+            logging.warning(f"Could not write {marker_file}: {e}")
 
     def save_current_progress(self, progress: Dict = None):
+        if progress is None and self.schedule_progress_flush("current"):
+            return
+        self.write_current_progress(progress)
+
+    def write_current_progress(self, progress: Dict = None):
         progress = progress or self.current_progress
         try:
-            progress["last_updated"] = datetime.now().isoformat()
-            if "current_progress" in progress:
-                progress["current_progress"]["processed_groceries"] = list(set(progress["current_progress"].get("processed_groceries", [])))
-                progress["completed_areas"] = list(set(progress.get("completed_areas", [])))
             area_name = progress["current_progress"].get("area_name") or "default"
             progress_file = f"current_progress_{area_name}.json"
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress, f, indent=2, ensure_ascii=False)
+            # Unchanged since the last write (last_updated included) means nothing to save
+            if self._written_digests.get(progress_file) == progress_digest(orjson.dumps(progress)):
+                return
+            progress["last_updated"] = datetime.now().isoformat()
+            payload = orjson.dumps(progress)
+            self.write_progress_file(progress_file, payload)
+            self._written_digests[progress_file] = progress_digest(payload)
             logging.info(f"Saved {progress_file} to local storage")
         except Exception as e:
             logging.error(f"Error saving {progress_file}: {e}")
@@ -648,8 +1030,8 @@ class MainScraper:
             area_name = self.current_progress.get("current_progress", {}).get("area_name") or "default"
             progress_file = f"scraped_progress_{area_name}.json"
             if os.path.exists(progress_file):
-                with open(progress_file, 'r', encoding='utf-8') as f:
-                    progress = json.load(f)
+                with open(progress_file, 'rb') as f:
+                    progress = orjson.loads(f.read())
                 if "current_progress" not in progress:
                     progress["current_progress"] = {}
                 if "all_results" not in progress:
@@ -664,10 +1046,11 @@ class MainScraper:
                 current.setdefault("current_category", None)
                 current.setdefault("current_sub_category", None)
                 current.setdefault("total_groceries", 0)
-                current["processed_groceries"] = list(set(current["processed_groceries"]))
-                progress["completed_areas"] = list(set(progress.get("completed_areas", [])))
+                current["processed_groceries"] = list(dict.fromkeys(current["processed_groceries"]))
+                progress["completed_areas"] = list(dict.fromkeys(progress.get("completed_areas", [])))
                 progress["last_updated"] = progress.get("last_updated", datetime.now().isoformat())
-                logging.info(f"Loaded {progress_file} from local storage")
+                logging.info(f"Loaded {progress_file} ({os.path.getsize(progress_file)} bytes) from local storage")
+                self.replay_scraped_journal(progress, progress_file)
                 return progress
         except Exception as e:
             logging.error(f"Error loading {progress_file} from local storage: {e}")
@@ -690,54 +1073,357 @@ class MainScraper:
             "all_results": {}
         }
         logging.info(f"{progress_file} not found, creating default")
+        self.replay_scraped_journal(default_progress, progress_file)
+        # Committed with the rest of the progress files by setup()
         self.save_scraped_progress(default_progress)
-        self.commit_progress(f"Created default {progress_file}")
         return default_progress
 
+    def replay_scraped_journal(self, progress: Dict, progress_file: str):
+        journal_file = progress_file + "l"
+        if not os.path.exists(journal_file):
+            return
+        records = 0
+        stale = 0
+        base_stamp = progress.get("last_updated")
+        try:
+            with open(journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # A torn last line from an interrupted write
+                        continue
+                    # Records appended against an older full file (e.g. a journal pushed before a
+                    # compaction that was only committed later) would roll newer results back
+                    if record.get("base", base_stamp) != base_stamp:
+                        stale += 1
+                        continue
+                    progress["current_progress"] = record["current_progress"]
+                    progress["completed_areas"] = record["completed_areas"]
+                    progress["current_area_index"] = record["current_area_index"]
+                    for area_name, grocery_title, grocery_data in record.get("groceries", []):
+                        progress["all_results"].setdefault(area_name, {})[grocery_title] = grocery_data
+                    records += 1
+            self._journal_records = records
+            self._journal_bytes = os.path.getsize(journal_file)
+            self._journal_base_bytes = os.path.getsize(progress_file)
+            self._journal_base_stamp = base_stamp
+            # Compact on the next save so the stale records are dropped from the journal
+            self._journal_base_file = None if stale else progress_file
+            if stale:
+                logging.warning(f"Skipped {stale} records in {journal_file} written against an older {progress_file}")
+            logging.info(f"Replayed {records} records from {journal_file}")
+        except Exception as e:
+            logging.error(f"Error replaying {journal_file}: {e}")
+
     def save_scraped_progress(self, progress: Dict = None):
+        if progress is None:
+            current = self.scraped_progress["current_progress"]
+            if current.get("current_grocery_title"):
+                self._dirty_groceries.add((current.get("area_name"), current["current_grocery_title"]))
+            if self.schedule_progress_flush("scraped"):
+                return
+        self.write_scraped_progress(progress)
+
+    def write_scraped_progress(self, progress: Dict = None, compact: bool = False):
+        # The full file holds all_results for every area, so most saves only append the
+        # groceries touched since the last save to a journal; the full file is rewritten on compaction
+        explicit = progress is not None
         progress = progress or self.scraped_progress
         try:
             progress["last_updated"] = datetime.now().isoformat()
-            if "current_progress" in progress:
-                progress["current_progress"]["processed_groceries"] = list(set(progress["current_progress"].get("processed_groceries", [])))
-                progress["completed_areas"] = list(set(progress.get("completed_areas", [])))
             area_name = progress["current_progress"].get("area_name") or "default"
             progress_file = f"scraped_progress_{area_name}.json"
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress, f, indent=2, ensure_ascii=False)
-            logging.info(f"Saved {progress_file} to local storage")
+            journal_file = progress_file + "l"
+            # Fold the journal back in after PROGRESS_COMPACT_EVERY records or once it grows past
+            # PROGRESS_COMPACT_RATIO of the full file, whichever comes first
+            compact = (
+                compact
+                or self._journal_records >= PROGRESS_COMPACT_EVERY
+                or self._journal_bytes > self._journal_base_bytes * PROGRESS_COMPACT_RATIO
+            )
+            if explicit or progress_file != self._journal_base_file or compact:
+                payload = orjson.dumps(progress)
+                self.write_progress_file(progress_file, payload)
+                # Truncated rather than removed so the committed journal path stays valid
+                self.write_progress_file(journal_file, b"")
+                self._journal_base_file = progress_file
+                self._journal_base_stamp = progress["last_updated"]
+                self._journal_records = 0
+                self._journal_bytes = 0
+                self._journal_base_bytes = len(payload)
+                self._dirty_groceries.clear()
+                logging.info(f"Saved {progress_file} to local storage")
+                return
+            groceries = [
+                [grocery_area, grocery_title, progress["all_results"].get(grocery_area, {}).get(grocery_title)]
+                for grocery_area, grocery_title in self._dirty_groceries
+            ]
+            self._dirty_groceries.clear()
+            record = {
+                "current_progress": progress["current_progress"],
+                "completed_areas": progress["completed_areas"],
+                "current_area_index": progress.get("current_area_index", 0),
+                "groceries": groceries,
+                "base": self._journal_base_stamp
+            }
+            payload = orjson.dumps(record)
+            digest = progress_digest(payload)
+            # Same record as the last append, replaying it again would change nothing
+            if self._written_digests.get(journal_file) == digest:
+                return
+            self.write_progress_file(journal_file, payload + b"\n", append=True)
+            self._written_digests[journal_file] = digest
+            self._journal_records += 1
+            self._journal_bytes += len(payload) + 1
+            logging.info(f"Appended progress record {self._journal_records} to {journal_file}")
         except Exception as e:
             logging.error(f"Error saving {progress_file}: {e}")
 
-    @retry(tries=3, delay=2, backoff=2)
-    def commit_progress(self, message: str = "Periodic progress förbättrande"):
+    def mark_grocery_processed(self, grocery_title):
+        # Keeps processed_groceries duplicate-free as it grows, so saves no longer re-dedupe
+        # it; the two progress dicts may share the same list after an area reset
+        for progress in (self.current_progress, self.scraped_progress):
+            processed_groceries = progress["current_progress"].setdefault("processed_groceries", [])
+            if grocery_title not in processed_groceries:
+                processed_groceries.append(grocery_title)
+
+    def mark_area_completed(self, area_name):
+        for progress in (self.current_progress, self.scraped_progress):
+            completed_areas = progress.setdefault("completed_areas", [])
+            if area_name not in completed_areas:
+                completed_areas.append(area_name)
+
+    def schedule_progress_flush(self, kind: str) -> bool:
+        # Outside the event loop (startup) saves are written straight away
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._dirty_progress.add(kind)
+        if self._progress_flusher is None or self._progress_flusher.done():
+            self._progress_flusher = asyncio.create_task(self.flush_progress_later())
+        return True
+
+    async def flush_progress_later(self):
+        await asyncio.sleep(PROGRESS_FLUSH_SECONDS)
+        await self.flush_progress_async()
+
+    def write_progress_file(self, path, payload, append=False):
+        if self._progress_writes is not None:
+            self._progress_writes.append((path, payload, append))
+        else:
+            write_progress_files([(path, payload, append)])
+
+    async def flush_progress_async(self, compact: bool = False):
+        # The dicts are only mutated on the event loop, so they are serialized here and
+        # just the file writes and journal fsync run in a thread; the lock keeps flushes ordered
+        async with self._progress_io_lock:
+            self._progress_writes = []
+            try:
+                self.flush_progress(compact)
+                writes = self._progress_writes
+            finally:
+                self._progress_writes = None
+            if writes:
+                await asyncio.to_thread(write_progress_files, writes)
+
+    def flush_progress(self, compact: bool = False):
+        dirty = self._dirty_progress
+        self._dirty_progress = set()
+        if "current" in dirty:
+            self.write_current_progress()
+        if "scraped" in dirty or compact:
+            self.write_scraped_progress(compact=compact)
+
+    def load_item_cache(self) -> Dict:
+        # The cache survives a resume through the Actions cache, not git; later lines
+        # override earlier ones, stale entries are dropped and the file is rewritten without them
+        cache = {}
+        cache_file = ITEM_CACHE_FILE
+        if not os.path.exists(cache_file):
+            return cache
+        cutoff = time.time() - ITEM_CACHE_TTL_SECONDS
+        lines = 0
+        try:
+            with open(cache_file, 'rb') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+                    if entry.get("cached_at", 0) >= cutoff:
+                        cache[entry["item_link"]] = entry
+            logging.info(f"Loaded {len(cache)} cached items from {cache_file}")
+            if lines > len(cache):
+                payload = b"".join(orjson.dumps(entry) + b"\n" for entry in cache.values())
+                write_progress_files([(cache_file, payload, False)])
+                logging.info(f"Compacted {cache_file} from {lines} to {len(cache)} entries")
+        except Exception as e:
+            logging.error(f"Error loading item cache {cache_file}: {e}")
+        return cache
+
+    def get_cached_item(self, item_link):
+        entry = self.item_cache.get(item_link)
+        if entry and time.time() - entry["cached_at"] < ITEM_CACHE_TTL_SECONDS:
+            return dict(entry["item_details"])
+        return None
+
+    def cache_item(self, item_link, item_details):
+        entry = {"item_link": item_link, "cached_at": time.time(), "item_details": item_details}
+        self.item_cache[item_link] = entry
+        cache_file = ITEM_CACHE_FILE
+        try:
+            with open(cache_file, 'ab') as f:
+                f.write(orjson.dumps(entry) + b"\n")
+        except Exception as e:
+            logging.error(f"Error appending to item cache {cache_file}: {e}")
+
+    async def acquire_page(self, context):
+        pool = self.page_pool.get(context)
+        while pool:
+            page = pool.pop()
+            if not page.is_closed():
+                return page
+        return await context.new_page()
+
+    async def release_page(self, page):
+        if page.is_closed():
+            return
+        pool = self.page_pool.setdefault(page.context, [])
+        if len(pool) >= PAGE_POOL_SIZE:
+            await page.close()
+            return
         try:
-            logging.info(f"Attempting to commit progress: {message}")
-            subprocess.run(["git", "add", "current_progress_*.json", "scraped_progress_*.json", self.output_dir], check=True, cwd=os.getcwd())
-            result = subprocess.run(["git", "commit", "-m", message], capture_output=True, text=True, cwd=os.getcwd())
-            if result.returncode == 0:
-                subprocess.run(["git", "push"], check=True, cwd=os.getcwd())
+            await page.goto("about:blank")
+        except Exception:
+            await page.close()
+            return
+        pool.append(page)
+
+    async def get_http_session(self, context):
+        # Pooled keep-alive client for plain HTML fetches, seeded with the browser's cookies
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=60),
+                headers={"User-Agent": HTTP_USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+            cookies = await context.cookies()
+            self.http_session.cookie_jar.update_cookies({cookie["name"]: cookie["value"] for cookie in cookies})
+        return self.http_session
+
+    async def close_http_session(self):
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+
+    async def commit_progress(self, message: str = "Periodic progress förbättrande", force: bool = False):
+        # Each commit pushes to the remote, so only go through every COMMIT_BATCH_SIZE
+        # calls or COMMIT_INTERVAL_SECONDS, unless forced at an area boundary
+        self._uncommitted_messages.append(message)
+        pending = len(self._uncommitted_messages)
+        now = time.monotonic()
+        if not force and pending < COMMIT_BATCH_SIZE and now - self._last_commit_time < COMMIT_INTERVAL_SECONDS:
+            logging.info(f"Deferring commit ({pending} pending): {message}")
+            return
+        if pending > 1:
+            # Latest update first, then the oldest few so the log shows where the batch started
+            summary = "; ".join(self._uncommitted_messages[:COMMIT_SUMMARY_MESSAGES])
+            message = f"{message} (batched {pending} updates: {summary})"
+        self._uncommitted_messages = []
+        self._last_commit_time = now
+        # git push can take seconds; hand it to the background worker and keep scraping
+        if self._commit_worker is None:
+            self._commit_queue = asyncio.Queue()
+            self._commit_worker = asyncio.create_task(self.run_commit_worker())
+        # output/ only changes meaningfully at area boundaries, so routine commits skip it
+        self._commit_queue.put_nowait((message, force))
+
+    async def run_commit_worker(self):
+        while True:
+            jobs = [await self._commit_queue.get()]
+            # Commits queued while the previous push was running go out together
+            while not self._commit_queue.empty():
+                jobs.append(self._commit_queue.get_nowait())
+            try:
+                await self.push_progress("; ".join(message for message, _ in jobs), any(include_output for _, include_output in jobs))
+            except Exception as e:
+                logging.error(f"Error in commit worker: {e}")
+            finally:
+                for _ in jobs:
+                    self._commit_queue.task_done()
+
+    async def run_git(self, *args):
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=os.getcwd(),
+            env=git_env(),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
+        )
+        output, _ = await process.communicate()
+        return process.returncode, output.decode(errors="replace")
+
+    async def push_progress(self, message: str, include_output: bool):
+        logging.info(f"Attempting to commit progress: {message}")
+        await self.flush_progress_async()
+        journal_files = glob.glob("scraped_progress_*.jsonl")
+        paths = ["current_progress_*.json", "scraped_progress_*.json", *journal_files]
+        if include_output:
+            paths.append(self.output_dir)
+        returncode, output = await self.run_git("add", *paths)
+        if returncode != 0:
+            logging.warning(f"Error staging progress: {output}. Continuing without commit.")
+            return
+        returncode, output = await self.run_git("commit", "-m", message)
+        if returncode != 0:
+            logging.info(f"No changes to commit: {output}")
+            # A forced commit still pushes whatever earlier commits are waiting
+            if not (include_output and self._commits_since_push):
+                return
+        else:
+            self._commits_since_push += 1
+        # Commits stay local until PUSH_EVERY_COMMITS pile up or an area boundary forces a push
+        if not include_output and self._commits_since_push < PUSH_EVERY_COMMITS:
+            logging.info(f"Committed locally ({self._commits_since_push} unpushed): {message}")
+            return
+        retries = 3
+        delay = 2
+        while retries > 0:
+            returncode, output = await self.run_git("push")
+            if returncode == 0:
+                self._commits_since_push = 0
                 logging.info(f"Successfully committed and pushed: {message}")
-            else:
-                logging.info(f"No changes to commit: {result.stdout}")
-        except subprocess.CalledProcessError as e:
-            logging.warning(f"Error committing progress: {e}. Continuing without commit.")
-            
+                return
+            retries -= 1
+            logging.warning(f"Error pushing progress: {output}. Retries left: {retries}")
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    async def flush_commits(self):
+        await self.flush_progress_async()
+        if self._commit_queue is not None:
+            await self._commit_queue.join()
+        # Leave a full file and an empty journal behind, so the next run starts from the base alone
+        await self.flush_progress_async(compact=True)
+        await self.push_progress("Compacted scraped progress before exit", include_output=True)
+
     async def process_grocery_categories(self, grocery_title, grocery_details, talabat_grocery, page, groceries_on_page, grocery_idx):
-        completed_groceries = self.current_progress["current_progress"]["completed_groceries"].get(grocery_title, {})
-        completed_categories = completed_groceries.get("completed categories", [])
-        current_category = self.current_progress["current_progress"].get("current_category")
-        current_sub_category = self.current_progress["current_progress"].get("current_sub_category")
+        current_progress = self.current_progress["current_progress"]
+        completed_groceries = current_progress["completed_groceries"].get(grocery_title, {})
+        completed_categories = set(completed_groceries.get("completed categories", []))
+        current_category = current_progress.get("current_category")
+        current_sub_category = current_progress.get("current_sub_category")
         categories = grocery_details.get("categories", {})
     
         if not categories:
             print(f"No categories found for {grocery_title}, marking as complete")
-            self.current_progress["current_progress"]["processed_groceries"].append(grocery_title)
-            self.scraped_progress["current_progress"]["processed_groceries"].append(grocery_title)
-            self.update_to_next_grocery(groceries_on_page, grocery_idx)
+            self.mark_grocery_processed(grocery_title)
+            await self.update_to_next_grocery(groceries_on_page, grocery_idx)
             self.save_current_progress()
             self.save_scraped_progress()
-            self.commit_progress(f"No categories for {grocery_title}, marked as complete")
+            await self.commit_progress(f"No categories for {grocery_title}, marked as complete")
             return
     
         start_processing = not current_category or not current_sub_category
@@ -749,16 +1435,14 @@ class MainScraper:
                 sub_categories = await talabat_grocery.extract_sub_categories(page, categories[category_name]["category_link"], grocery_title, category_name)
                 sub_category_names = [sub["sub_category_name"] for sub in sub_categories]
                 if current_sub_category in sub_category_names:
-                    self.current_progress["current_progress"]["current_category"] = category_name
-                    self.scraped_progress["current_progress"]["current_category"] = category_name
+                    current_progress["current_category"] = category_name
                     self.save_current_progress()
                     self.save_scraped_progress()
                     found = True
                     break
             if not found:
                 print(f"Warning: Current sub-category {current_sub_category} not found in any category, resetting current_category")
-                self.current_progress["current_progress"]["current_category"] = None
-                self.scraped_progress["current_progress"]["current_category"] = None
+                current_progress["current_category"] = None
                 start_processing = True
     
         for idx, category_name in enumerate(category_names):
@@ -774,34 +1458,35 @@ class MainScraper:
                     continue
     
             print(f"Processing category {idx + 1}/{len(category_names)}: {category_name}")
-            self.current_progress["current_progress"]["current_category"] = category_name
-            self.scraped_progress["current_progress"]["current_category"] = category_name
+            current_progress["current_category"] = category_name
             self.save_current_progress()
             self.save_scraped_progress()
     
-            temp_page = await self.browser.new_page()
-            await self.process_category(grocery_title, categories[category_name], category_name, talabat_grocery, temp_page)
-            await temp_page.close()
+            temp_page = await talabat_grocery.new_page()
+            try:
+                await self.process_category(grocery_title, categories[category_name], category_name, talabat_grocery, temp_page)
+            finally:
+                await self.release_page(temp_page)
     
-            completed_groceries = self.current_progress["current_progress"]["completed_groceries"].get(grocery_title, {})
+            completed_groceries = current_progress["completed_groceries"].get(grocery_title, {})
             if category_name in completed_groceries.get("completed categories", []):
-                self.move_to_next_category(category_names, idx, grocery_title, completed_categories)
+                await self.move_to_next_category(category_names, idx, grocery_title, completed_categories)
     
         await self.verify_and_scrape_missing_sub_categories(grocery_title, grocery_details, talabat_grocery, page)
     
-        completed_groceries = self.current_progress["current_progress"]["completed_groceries"].get(grocery_title, {})
-        if all(cat in completed_groceries.get("completed categories", []) for cat in category_names):
-            self.current_progress["current_progress"]["processed_groceries"].append(grocery_title)
-            self.scraped_progress["current_progress"]["processed_groceries"].append(grocery_title)
-            self.update_to_next_grocery(groceries_on_page, grocery_idx)
+        completed_groceries = current_progress["completed_groceries"].get(grocery_title, {})
+        if set(category_names) <= set(completed_groceries.get("completed categories", [])):
+            self.mark_grocery_processed(grocery_title)
+            await self.update_to_next_grocery(groceries_on_page, grocery_idx)
             self.save_current_progress()
             self.save_scraped_progress()
-            self.commit_progress(f"Completed all categories for {grocery_title}")
+            await self.commit_progress(f"Completed all categories for {grocery_title}")
 
     async def verify_and_scrape_missing_sub_categories(self, grocery_title, grocery_details, talabat_grocery, page):
         print(f"Verifying sub-categories for grocery: {grocery_title}")
-        area_name = self.current_progress["current_progress"]["area_name"]
-        completed_groceries = self.current_progress["current_progress"]["completed_groceries"].setdefault(grocery_title, {})
+        current_progress = self.current_progress["current_progress"]
+        area_name = current_progress["area_name"]
+        completed_groceries = current_progress["completed_groceries"].setdefault(grocery_title, {})
         completed_sub_categories = completed_groceries.get("completed sub-categories", [])
     
         for category_name, category_data in grocery_details.get("categories", {}).items():
@@ -815,10 +1500,8 @@ class MainScraper:
                     sub_category_name = missing_sub["sub_category_name"]
                     sub_category_link = missing_sub["sub_category_link"]
                     print(f"Scraping missing sub-category: {sub_category_name}")
-                    self.current_progress["current_progress"]["current_category"] = category_name
-                    self.current_progress["current_progress"]["current_sub_category"] = sub_category_name
-                    self.scraped_progress["current_progress"]["current_category"] = category_name
-                    self.scraped_progress["current_progress"]["current_sub_category"] = sub_category_name
+                    current_progress["current_category"] = category_name
+                    current_progress["current_sub_category"] = sub_category_name
                     self.save_current_progress()
                     self.save_scraped_progress()
                     items = await talabat_grocery.extract_all_items_from_sub_category(sub_category_link)
@@ -832,8 +1515,7 @@ class MainScraper:
     
                     completed_sub_categories.append(sub_category_name)
                     completed_groceries["completed sub-categories"] = completed_sub_categories
-                    self.current_progress["current_progress"]["completed_groceries"][grocery_title] = completed_groceries
-                    self.main_scraper.scraped_progress["current_progress"]["completed_groceries"] = self.main_scraper.current_progress["current_progress"]["completed_groceries"]
+                    current_progress["completed_groceries"][grocery_title] = completed_groceries
     
                     grocery_data = self.scraped_progress["all_results"].setdefault(area_name, {}).setdefault(grocery_title, {
                         "grocery_link": talabat_grocery.url,
@@ -843,51 +1525,32 @@ class MainScraper:
                     grocery_data["grocery_details"] = grocery_details
                     self.scraped_progress["all_results"][area_name][grocery_title] = grocery_data
     
-                    self.current_progress["current_progress"]["current_sub_category"] = None
-                    self.scraped_progress["current_progress"]["current_sub_category"] = None
-                    self.current_progress["current_progress"]["current_category"] = None
-                    self.scraped_progress["current_progress"]["current_category"] = None
+                    current_progress["current_sub_category"] = None
+                    current_progress["current_category"] = None
                     self.save_current_progress()
                     self.save_scraped_progress()
-                    self.commit_progress(f"Scraped missing sub-category {sub_category_name} for {grocery_title} in {category_name}")
-    
-        json_filename = os.path.join(self.output_dir, f"{area_name}.json")
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(self.scraped_progress["all_results"].get(area_name, {}), f, indent=2, ensure_ascii=False)
-        logging.info(f"Saved {json_filename} to local storage")
+                    await self.commit_progress(f"Scraped missing sub-category {sub_category_name} for {grocery_title} in {category_name}")
     
-        print(f"Waiting 30 seconds before updating Excel for {area_name}...")
-        await asyncio.sleep(30)
-        await self.convert_json_to_excel(area_name, json_filename)
-    
-    def move_to_next_category(self, category_names, current_idx, grocery_title, completed_categories):
+    async def move_to_next_category(self, category_names, current_idx, grocery_title, completed_categories):
+        current_progress = self.current_progress["current_progress"]
         next_idx = current_idx + 1
-        self.current_progress["current_progress"]["current_category"] = None
-        self.scraped_progress["current_progress"]["current_category"] = None
-        self.current_progress["current_progress"]["current_sub_category"] = None
-        self.scraped_progress["current_progress"]["current_sub_category"] = None
+        current_progress["current_category"] = None
+        current_progress["current_sub_category"] = None
         while next_idx < len(category_names):
             next_category = category_names[next_idx]
             if next_category not in completed_categories:
-                self.current_progress["current_progress"]["current_category"] = next_category
-                self.scraped_progress["current_progress"]["current_category"] = next_category
+                current_progress["current_category"] = next_category
                 break
             next_idx += 1
         self.save_current_progress()
         self.save_scraped_progress()
-        self.commit_progress(f"Moved to next category after {category_names[current_idx]} for {grocery_title}")
+        await self.commit_progress(f"Moved to next category after {category_names[current_idx]} for {grocery_title}")
 
-    def update_to_next_grocery(self, groceries_on_page, current_idx):
-        processed_grocery_titles = set(self.current_progress["current_progress"]["processed_groceries"])
+    async def update_to_next_grocery(self, groceries_on_page, current_idx):
+        current_progress = self.current_progress["current_progress"]
+        processed_grocery_titles = set(current_progress["processed_groceries"])
         next_idx = current_idx + 1
-        self.current_progress["current_progress"].update({
-            "current_grocery": 0,
-            "current_grocery_title": None,
-            "current_grocery_link": None,
-            "current_category": None,
-            "current_sub_category": None
-        })
-        self.scraped_progress["current_progress"].update({
+        current_progress.update({
             "current_grocery": 0,
             "current_grocery_title": None,
             "current_grocery_link": None,
@@ -897,12 +1560,7 @@ class MainScraper:
         while next_idx < len(groceries_on_page):
             next_grocery = groceries_on_page[next_idx]
             if next_grocery["grocery_title"] not in processed_grocery_titles:
-                self.current_progress["current_progress"].update({
-                    "current_grocery": next_idx + 1,
-                    "current_grocery_title": next_grocery["grocery_title"],
-                    "current_grocery_link": next_grocery["grocery_link"]
-                })
-                self.scraped_progress["current_progress"].update({
+                current_progress.update({
                     "current_grocery": next_idx + 1,
                     "current_grocery_title": next_grocery["grocery_title"],
                     "current_grocery_link": next_grocery["grocery_link"]
@@ -911,71 +1569,46 @@ class MainScraper:
             next_idx += 1
         self.save_current_progress()
         self.save_scraped_progress()
-        self.commit_progress(f"Updated to next grocery after index {current_idx}")
+        await self.commit_progress(f"Updated to next grocery after index {current_idx}")
 
     async def convert_json_to_excel(self, area_name: str, json_filename: str):
+        # Excel serialization is CPU-bound, so it runs in a worker process and the
+        # event loop keeps scraping the next area meanwhile
+        excel_filename = os.path.join(self.output_dir, f"{area_name}_detailed.xlsx")
+        loop = asyncio.get_running_loop()
         try:
-            with open(json_filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not data:
-                logging.warning(f"No data to write to Excel for area: {area_name}")
-                return
-
-            excel_filename = os.path.join(self.output_dir, f"{area_name}_detailed.xlsx")
-            with pd.ExcelWriter(excel_filename, engine='openpyxl') as writer:
-                for grocery_title, grocery_data in data.items():
-                    sheet_name = re.sub(r'[\\\/:*?"<>|]', '_', grocery_title)[:31]
-                    general_info = {
-                        "Grocery Title": grocery_title,
-                        "Delivery Time": grocery_data.get("delivery_time", "N/A"),
-                        "Delivery Fees": grocery_data.get("grocery_details", {}).get("delivery_fees", "N/A"),
-                        "Minimum Order": grocery_data.get("grocery_details", {}).get("minimum_order", "N/A"),
-                        "URL": grocery_data.get("grocery_link", "N/A")
-                    }
-                    simplified_data = []
-                    for category_name, category_data in grocery_data.get("grocery_details", {}).get("categories", {}).items():
-                        for sub_category in category_data.get("sub_categories", []):
-                            items_list = [
-                                {
-                                    "Item Name": item.get("item_name", "N/A"),
-                                    "Item Price": item.get("item_price", "N/A"),
-                                    "Item Old Price": item.get("item_old_price", None),
-                                    "Item Offer": item.get("item_offer", None),
-                                    "Item Description": item.get("item_description", "N/A"),
-                                    "Item Link": item.get("item_link", "N/A")
-                                }
-                                for item in sub_category.get("items", [])
-                            ]
-                            items_json = json.dumps(items_list, ensure_ascii=False)
-                            simplified_data.append({
-                                **general_info,
-                                "Category": category_name,
-                                "Category Link": category_data.get("category_link", "N/A"),
-                                "Sub-Category": sub_category.get("sub_category_name", "N/A"),
-                                "Sub-Category Link": sub_category.get("sub_category_link", "N/A"),
-                                "Items": items_json
-                            })
-                    
-                    if simplified_data:
-                        df = pd.DataFrame(simplified_data)
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-                        logging.info(f"Added sheet '{sheet_name}' to Excel: {excel_filename}")
-                    else:
-                        logging.warning(f"No data for grocery '{grocery_title}' in area: {area_name}")
-
-            logging.info(f"Saved Excel to local storage: {excel_filename}")
+            await loop.run_in_executor(EXCEL_EXECUTOR, write_area_excel, area_name, json_filename, excel_filename)
         except Exception as e:
             logging.error(f"Error converting JSON to Excel for {area_name}: {e}")
 
-    async def scrape_and_save_area(self, area_name: str, area_url: str, browser) -> List[Dict]:
+    async def convert_area_to_excel(self, area_name: str, json_filename: str):
+        print(f"Waiting 30 seconds before converting {area_name}.json to Excel...")
+        await asyncio.sleep(30)
+        await self.convert_json_to_excel(area_name, json_filename)
+
+    async def wait_for_excel_exports(self):
+        if self.excel_tasks:
+            print(f"Waiting for {len(self.excel_tasks)} Excel export(s) to finish...")
+            await asyncio.gather(*self.excel_tasks)
+            self.excel_tasks.clear()
+            await self.commit_progress("Exported area Excel files", force=True)
+
+    async def scrape_and_save_area(self, area_name: str, area_url: str, browser, context=None) -> List[Dict]:
         self.browser = browser
+        # Listing and grocery pages share one context across areas when run() provides it
+        area_context = context or await new_scraper_context(browser)
         print(f"\n{'='*50}\nSCRAPING AREA: {area_name}\nURL: {area_url}\n{'='*50}")
-        all_area_results = self.scraped_progress["all_results"].get(area_name, {})
         current_progress = self.current_progress["current_progress"]
-        scraped_current_progress = self.scraped_progress["current_progress"]
 
-        if current_progress["area_name"] != area_name:
+        if current_progress["area_name"] == area_name:
+            # Resuming this area: a finished area is dropped from memory, so fall back to its file
+            all_area_results = self.scraped_progress["all_results"].get(area_name)
+            if all_area_results is None:
+                all_area_results = self.load_area_results(area_name)
+        else:
+            # A fresh start never builds on an earlier run's results
+            all_area_results = {}
+            self.scraped_progress["all_results"][area_name] = all_area_results
             current_progress.update({
                 "area_name": area_name,
                 "current_grocery": 0,
@@ -987,90 +1620,43 @@ class MainScraper:
                 "current_sub_category": None,
                 "completed_groceries": {}
             })
-            scraped_current_progress.update(current_progress)
             self.save_current_progress()
             self.save_scraped_progress()
-            self.commit_progress(f"Started scraping {area_name}")
+            await self.commit_progress(f"Started scraping {area_name}")
 
-        page = await browser.new_page()
-        await page.goto(area_url, timeout=60000)
-        groceries_on_page = await self.get_page_groceries(page)
+        groceries_on_page = await self.load_area_groceries(area_context, area_url)
         current_progress["total_groceries"] = len(groceries_on_page)
-        scraped_current_progress["total_groceries"] = len(groceries_on_page)
         print(f"Found {len(groceries_on_page)} groceries")
-        await page.close()
 
         processed_grocery_titles = set(current_progress["processed_groceries"])
         current_grocery_title = current_progress.get("current_grocery_title")
         current_grocery_link = current_progress.get("current_grocery_link")
 
-        for grocery_idx, grocery in enumerate(groceries_on_page):
-            grocery_num = grocery_idx + 1
+        async def scrape_grocery(grocery_idx, grocery_num, grocery, grocery_list):
             grocery_title = grocery["grocery_title"]
             grocery_link = grocery["grocery_link"]
-
-            if grocery_title in processed_grocery_titles:
-                print(f"Skipping already processed grocery: {grocery_title} (link: {grocery_link})")
-                continue
-
-            if current_grocery_title and current_grocery_title != grocery_title:
-                print(f"Skipping grocery {grocery_title}, waiting for current grocery {current_grocery_title} ({current_grocery_link})")
-                continue
-
             current_progress["current_grocery"] = grocery_num
             current_progress["current_grocery_title"] = grocery_title
             current_progress["current_grocery_link"] = grocery_link
-            scraped_current_progress["current_grocery"] = grocery_num
-            scraped_current_progress["current_grocery_title"] = grocery_title
-            scraped_current_progress["current_grocery_link"] = grocery_link
             self.save_current_progress()
             self.save_scraped_progress()
-            print(f"Processing grocery {grocery_num}/{len(groceries_on_page)}: {grocery_title} (link: {grocery_link})")
-
-            grocery_page = await browser.new_page()
-            talabat_grocery = TalabatGroceries(grocery_link, browser, self)
-            grocery_details = await talabat_grocery.extract_categories(grocery_page)
-            all_area_results[grocery_title] = {
-                "grocery_link": grocery_link,
-                "delivery_time": grocery["delivery_time"],
-                "grocery_details": grocery_details
-            }
-            self.scraped_progress["all_results"][area_name] = all_area_results
-            self.save_scraped_progress()
-
-            await self.process_grocery_categories(grocery_title, grocery_details, talabat_grocery, grocery_page, groceries_on_page, grocery_idx)
-            await grocery_page.close()
-
-            if current_grocery_title == grocery_title:
-                break
-
-        print(f"Verifying groceries for area: {area_name}")
-        page = await browser.new_page()
-        await page.goto(area_url, timeout=60000)
-        current_groceries = await self.get_page_groceries(page)
-        await page.close()
-
-        missing_groceries = [g for g in current_groceries if g["grocery_title"] not in processed_grocery_titles]
-        if missing_groceries:
-            print(f"Found {len(missing_groceries)} missing groceries in {area_name}")
-            for grocery_idx, grocery in enumerate(missing_groceries):
-                grocery_num = len(groceries_on_page) + grocery_idx + 1
-                grocery_title = grocery["grocery_title"]
-                grocery_link = grocery["grocery_link"]
-                print(f"Processing missing grocery {grocery_num}: {grocery_title} (link: {grocery_link})")
-
-                current_progress["current_grocery"] = grocery_num
-                current_progress["current_grocery_title"] = grocery_title
-                current_progress["current_grocery_link"] = grocery_link
-                scraped_current_progress["current_grocery"] = grocery_num
-                scraped_current_progress["current_grocery_title"] = grocery_title
-                scraped_current_progress["current_grocery_link"] = grocery_link
-                self.save_current_progress()
-                self.save_scraped_progress()
+            print(f"Processing grocery {grocery_num}/{len(grocery_list)}: {grocery_title} (link: {grocery_link})")
 
-                grocery_page = await browser.new_page()
-                talabat_grocery = TalabatGroceries(grocery_link, browser, self)
+            grocery_page = await self.acquire_page(area_context)
+            try:
+                talabat_grocery = TalabatGroceries(grocery_link, browser, self, area_context)
                 grocery_details = await talabat_grocery.extract_categories(grocery_page)
+                # Only the grocery an interrupted run stopped in keeps its saved sub-categories,
+                # so resume scrapes just the rest; everything else starts from fresh data
+                if grocery_title == current_grocery_title:
+                    saved_categories = all_area_results.get(grocery_title, {}).get("grocery_details", {}).get("categories", {})
+                    for category_name, category_data in grocery_details.get("categories", {}).items():
+                        saved_category = saved_categories.get(category_name)
+                        if saved_category and saved_category.get("category_link") == category_data["category_link"]:
+                            category_data["sub_categories"] = [
+                                sub_category for sub_category in saved_category.get("sub_categories", [])
+                                if sub_category.get("items")
+                            ]
                 all_area_results[grocery_title] = {
                     "grocery_link": grocery_link,
                     "delivery_time": grocery["delivery_time"],
@@ -1079,12 +1665,36 @@ class MainScraper:
                 self.scraped_progress["all_results"][area_name] = all_area_results
                 self.save_scraped_progress()
 
-                await self.process_grocery_categories(grocery_title, grocery_details, talabat_grocery, grocery_page, groceries_on_page + missing_groceries, grocery_idx)
-                await grocery_page.close()
+                await self.process_grocery_categories(grocery_title, grocery_details, talabat_grocery, grocery_page, grocery_list, grocery_idx)
+            finally:
+                await self.release_page(grocery_page)
+
+        remaining_groceries = [
+            (grocery_idx, grocery) for grocery_idx, grocery in enumerate(groceries_on_page)
+            if grocery["grocery_title"] not in processed_grocery_titles
+        ]
+        print(f"Skipping {len(groceries_on_page) - len(remaining_groceries)} already processed groceries")
+        if current_grocery_title:
+            # A resumed run only finishes the grocery it stopped in; the rest are picked up below
+            print(f"Resuming at current grocery {current_grocery_title} ({current_grocery_link})")
+            remaining_groceries = [entry for entry in remaining_groceries if entry[1]["grocery_title"] == current_grocery_title][:1]
+        for grocery_idx, grocery in remaining_groceries:
+            await scrape_grocery(grocery_idx, grocery_idx + 1, grocery, groceries_on_page)
+
+        print(f"Verifying groceries for area: {area_name}")
+        current_groceries = await self.load_area_groceries(area_context, area_url)
+
+        missing_groceries = [g for g in current_groceries if g["grocery_title"] not in processed_grocery_titles]
+        if missing_groceries:
+            print(f"Found {len(missing_groceries)} missing groceries in {area_name}")
+            for grocery_idx, grocery in enumerate(missing_groceries):
+                await scrape_grocery(grocery_idx, len(groceries_on_page) + grocery_idx + 1, grocery, groceries_on_page + missing_groceries)
 
         json_filename = os.path.join(self.output_dir, f"{area_name}.json")
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(all_area_results, f, indent=2, ensure_ascii=False)
+        tmp_filename = f"{json_filename}.tmp"
+        with open(tmp_filename, 'wb') as f:
+            f.write(orjson.dumps(all_area_results, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_filename, json_filename)
         logging.info(f"Saved {json_filename} to local storage")
 
         processed_grocery_titles = set(current_progress["processed_groceries"])
@@ -1100,44 +1710,93 @@ class MainScraper:
                 "current_sub_category": None,
                 "completed_groceries": {}
             })
-            scraped_current_progress.update(current_progress)
-            self.current_progress["completed_areas"].append(area_name)
-            self.scraped_progress["completed_areas"].append(area_name)
+            self.mark_area_completed(area_name)
+            # The finished area lives in output/<area>.json from here on, so only areas still
+            # being scraped stay in memory; the progress file sheds it at the next compaction
+            self.scraped_progress["all_results"].pop(area_name, None)
 
         self.save_current_progress()
         self.save_scraped_progress()
-        self.commit_progress(f"Completed {area_name}")
+        await self.commit_progress(f"Completed {area_name}", force=True)
 
-        print(f"Waiting 30 seconds before converting {area_name}.json to Excel...")
-        await asyncio.sleep(30)
-        await self.convert_json_to_excel(area_name, json_filename)
+        if area_context is not context:
+            self.page_pool.pop(area_context, None)
+            await area_context.close()
+        self.excel_tasks.append(asyncio.create_task(self.convert_area_to_excel(area_name, json_filename)))
 
         return list(all_area_results.values())
 
     async def process_category(self, grocery_title, category_data, category_name, talabat_grocery, page):
         sub_categories = await talabat_grocery.extract_sub_categories(page, category_data["category_link"], grocery_title, category_name)
-        category_data["sub_categories"] = sub_categories
+        category_data["sub_categories"] = merge_sub_categories(category_data.get("sub_categories", []), sub_categories)
         self.save_current_progress()
         self.save_scraped_progress()
 
+    def load_area_results(self, area_name) -> Dict:
+        json_filename = os.path.join(self.output_dir, f"{area_name}.json")
+        if not os.path.exists(json_filename):
+            return {}
+        try:
+            with open(json_filename, 'rb') as f:
+                area_results = orjson.loads(f.read())
+            logging.info(f"Loaded {len(area_results)} groceries for {area_name} from {json_filename}")
+            return area_results
+        except Exception as e:
+            logging.error(f"Error loading {json_filename}: {e}")
+            return {}
+
+    async def load_area_groceries(self, context, area_url) -> List[Dict]:
+        # The vendor listing is usually server-rendered, so try the plain HTML first
+        # and only render the page in the browser when no vendor cards are found
+        try:
+            response = await context.request.get(area_url, timeout=NAVIGATION_TIMEOUT)
+            if response.ok:
+                groceries_info = self.groceries_from_vendor_cards(self.parse_vendor_cards(await response.text()))
+                if groceries_info:
+                    return groceries_info
+        except Exception as e:
+            logging.error(f"Error fetching {area_url} directly: {e}")
+        logging.info(f"Falling back to page navigation for {area_url}")
+        page = await self.acquire_page(context)
+        try:
+            await page.goto(area_url, timeout=NAVIGATION_TIMEOUT, wait_until="domcontentloaded")
+            return await self.get_page_groceries(page)
+        finally:
+            await self.release_page(page)
+
+    def parse_vendor_cards(self, html) -> List[Dict]:
+        # Mirrors VENDOR_CARDS_JS on server-rendered HTML
+        soup = BeautifulSoup(html, "html.parser")
+        vendor_cards = []
+        for container in soup.select(VENDOR_CONTAINER_SELECTOR):
+            link = container.select_one('a')
+            title = container.select_one('a div h2')
+            delivery = container.select_one('div.deliveryInfo')
+            vendor_cards.append({
+                "title": title.get_text() if title else "Unknown Grocery",
+                "href": link.get('href') if link else None,
+                "delivery": delivery.get_text() if delivery else ""
+            })
+        return vendor_cards
+
+    def groceries_from_vendor_cards(self, vendor_cards) -> List[Dict]:
+        groceries_info = []
+        for card in vendor_cards:
+            if not card["href"]:
+                continue
+            match = _DIGITS_RE.search(card["delivery"])
+            delivery_time = f"{match.group()} mins" if match else "N/A"
+            groceries_info.append({"grocery_title": card["title"], "grocery_link": "https://www.talabat.com" + card["href"], "delivery_time": delivery_time})
+        logging.info(f"Extracted {len(groceries_info)} groceries: {[g['grocery_title'] for g in groceries_info]}")
+        return groceries_info
+
     async def get_page_groceries(self, page) -> List[Dict]:
         logging.info("Extracting grocery information")
         try:
-            await page.wait_for_selector('div[data-testid="one-vendor-container"]', timeout=30000)
-            vendor_containers = await page.query_selector_all('div[data-testid="one-vendor-container"]')
-            groceries_info = []
-            for container in vendor_containers:
-                title_element = await container.query_selector('a div h2')
-                title = await title_element.inner_text() if title_element else "Unknown Grocery"
-                link_element = await container.query_selector('a')
-                link = "https://www.talabat.com" + await link_element.get_attribute('href') if link_element else None
-                delivery_info = await container.query_selector('div.deliveryInfo')
-                delivery_time_text = await delivery_info.inner_text() if delivery_info else ""
-                delivery_time = re.findall(r'\d+', delivery_time_text)[0] + " mins" if re.findall(r'\d+', delivery_time_text) else "N/A"
-                if link:
-                    groceries_info.append({"grocery_title": title, "grocery_link": link, "delivery_time": delivery_time})
-            logging.info(f"Extracted {len(groceries_info)} groceries: {[g['grocery_title'] for g in groceries_info]}")
-            return groceries_info
+            await page.wait_for_selector(VENDOR_CONTAINER_SELECTOR, timeout=SELECTOR_TIMEOUT)
+            # One protocol call for every vendor card instead of several per container
+            vendor_cards = await page.eval_on_selector_all(VENDOR_CONTAINER_SELECTOR, VENDOR_CARDS_JS)
+            return self.groceries_from_vendor_cards(vendor_cards)
         except Exception as e:
             logging.error(f"Error extracting groceries: {e}")
             return []
@@ -1176,7 +1835,8 @@ class MainScraper:
         ]
 
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+            browser = await launch_or_connect(p)
+            context = await new_scraper_context(browser)
             current_area_index = self.current_progress["current_area_index"]
             for idx, (area_name, area_url) in enumerate(ahmadi_areas):
                 if idx < current_area_index or area_name in self.current_progress["completed_areas"]:
@@ -1184,14 +1844,178 @@ class MainScraper:
                     continue
                 self.current_progress["current_area_index"] = idx
                 self.scraped_progress["current_area_index"] = idx
-                await self.scrape_and_save_area(area_name, area_url, browser)
-                self.save_current_progress()
-                self.save_scraped_progress()
-                self.commit_progress(f"Completed {area_name}")
+                try:
+                    # Saves, commits and pushes the area itself once it is done
+                    await self.scrape_and_save_area(area_name, area_url, browser, context)
+                except Exception as e:
+                    # Stop here so the cursor still points at this area when the next run resumes
+                    print(f"Error scraping area {area_name}: {e}")
+                    logging.error(f"Error scraping area {area_name}: {e}")
+                    break
+                await save_storage_state(context)
+            await save_storage_state(context)
+            self.page_pool.clear()
+            await context.close()
             await browser.close()
+        await self.close_http_session()
+        await self.wait_for_excel_exports()
+        await self.flush_commits()
 
         print("SCRAPING COMPLETED")
 
+async def block_heavy_resources(route):
+    host = urlparse(route.request.url).hostname or ""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES or host.endswith(BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+_seen_api_endpoints = set()
+
+def log_api_response(response):
+    # Discovery aid for replacing DOM scraping with the JSON the frontend already fetches
+    if response.request.resource_type not in ("xhr", "fetch"):
+        return
+    if "json" not in response.headers.get("content-type", ""):
+        return
+    endpoint = response.url.split("?")[0]
+    if endpoint in _seen_api_endpoints:
+        return
+    _seen_api_endpoints.add(endpoint)
+    logging.info(f"Discovered JSON endpoint: {response.request.method} {response.url}")
+    try:
+        with open(API_ENDPOINTS_FILE, 'a', encoding='utf-8') as f:
+            f.write(f"{response.request.method} {response.url}\n")
+    except Exception as e:
+        logging.error(f"Error recording API endpoint {endpoint}: {e}")
+
+async def new_scraper_context(browser):
+    storage_state = STORAGE_STATE_FILE if os.path.exists(STORAGE_STATE_FILE) else None
+    try:
+        context = await browser.new_context(storage_state=storage_state)
+    except Exception as e:
+        logging.warning(f"Could not restore {STORAGE_STATE_FILE}: {e}")
+        context = await browser.new_context()
+    context.set_default_timeout(ACTION_TIMEOUT)
+    context.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
+    await context.route("**/*", block_heavy_resources)
+    if DISCOVER_API:
+        context.on("response", log_api_response)
+    return context
+
+async def save_storage_state(context):
+    try:
+        await context.storage_state(path=STORAGE_STATE_FILE)
+        logging.info(f"Saved browser storage state to {STORAGE_STATE_FILE}")
+    except Exception as e:
+        logging.error(f"Error saving browser storage state: {e}")
+
+async def launch_or_connect(p):
+    # Reuse an already running Chromium (e.g. one left up by a scheduler) when CDP_URL is set
+    cdp_url = os.environ.get("CDP_URL")
+    if cdp_url:
+        try:
+            browser = await p.chromium.connect_over_cdp(cdp_url)
+            print(f"Connected to running Chromium at {cdp_url}")
+            return browser
+        except Exception as e:
+            print(f"Could not connect to Chromium at {cdp_url}: {e}. Launching a new browser")
+    browser = await p.chromium.launch(
+        headless=True,
+        args=[f"--remote-debugging-port={CDP_PORT}", *CHROMIUM_ARGS],
+        ignore_default_args=["--enable-automation"]
+    )
+    print(f"Launched Chromium with CDP endpoint http://localhost:{CDP_PORT}")
+    return browser
+
+def iter_excel_rows(grocery_title, grocery_data):
+    # One tuple per sub-category, in EXCEL_COLUMNS order
+    # Missing values are left as None so the cell is skipped instead of holding "N/A"
+    grocery_title = sys.intern(grocery_title)
+    grocery_details = grocery_data.get("grocery_details") or {}
+    delivery_time = grocery_data.get("delivery_time")
+    delivery_fees = grocery_details.get("delivery_fees")
+    minimum_order = grocery_details.get("minimum_order")
+    grocery_link = grocery_data.get("grocery_link")
+    for category_name, category_data in grocery_details.get("categories", {}).items():
+        category_name = sys.intern(category_name)
+        category_link = category_data.get("category_link")
+        for sub_category in category_data.get("sub_categories", []):
+            sub_category_name = sub_category.get("sub_category_name")
+            if sub_category_name is not None:
+                sub_category_name = sys.intern(sub_category_name)
+            items_list = [
+                {
+                    "Item Name": item.get("item_name", "N/A"),
+                    "Item Price": item.get("item_price", "N/A"),
+                    "Item Old Price": item.get("item_old_price", None),
+                    "Item Offer": item.get("item_offer", None),
+                    "Item Description": item.get("item_description", "N/A"),
+                    "Item Link": item.get("item_link", "N/A")
+                }
+                for item in sub_category.get("items", [])
+            ]
+            yield (
+                grocery_title,
+                delivery_time,
+                delivery_fees,
+                minimum_order,
+                grocery_link,
+                category_name,
+                category_link,
+                sub_category_name,
+                sub_category.get("sub_category_link"),
+                orjson.dumps(items_list).decode()
+            )
+
+def write_area_excel(area_name: str, json_filename: str, excel_filename: str):
+    # Module-level so it can run in EXCEL_EXECUTOR worker processes
+    try:
+        if os.path.exists(excel_filename) and os.path.getmtime(excel_filename) >= os.path.getmtime(json_filename):
+            logging.info(f"{excel_filename} is newer than {json_filename}, skipping Excel export")
+            return
+        with open(json_filename, 'rb') as f:
+            data = orjson.loads(f.read())
+        
+        if not data:
+            logging.warning(f"No data to write to Excel for area: {area_name}")
+            return
+
+        # xlsxwriter streams each row to the sheet XML without building cell objects;
+        # the workbook is only created once there is a sheet to write, and is written
+        # to a temporary file that replaces the previous export only once complete
+        tmp_filename = f"{excel_filename}.tmp"
+        workbook = None
+        sheet_names = set()
+        for grocery_title, grocery_data in data.items():
+            sheet_name = _SHEET_NAME_RE.sub('_', grocery_title)[:31]
+            if sheet_name.lower() in sheet_names:
+                sheet_name = f"{sheet_name[:27]}_{len(sheet_names)}"
+            # Rows go straight from the generator to the sheet rather than being collected first
+            rows = iter_excel_rows(grocery_title, grocery_data)
+            first_row = next(rows, None)
+            if first_row is None:
+                logging.warning(f"No data for grocery '{grocery_title}' in area: {area_name}")
+                continue
+            if workbook is None:
+                workbook = Workbook(tmp_filename, EXCEL_WORKBOOK_OPTIONS)
+            sheet = workbook.add_worksheet(sheet_name)
+            sheet_names.add(sheet_name.lower())
+            sheet.write_row(0, 0, EXCEL_COLUMNS)
+            sheet.write_row(1, 0, first_row)
+            for row_idx, row in enumerate(rows, start=2):
+                sheet.write_row(row_idx, 0, row)
+            logging.info(f"Added sheet '{sheet_name}' to Excel: {excel_filename}")
+
+        if workbook is None:
+            logging.warning(f"No sheets to write to Excel for area: {area_name}")
+            return
+        workbook.close()
+        os.replace(tmp_filename, excel_filename)
+        logging.info(f"Saved Excel to local storage: {excel_filename}")
+    except Exception as e:
+        logging.error(f"Error converting JSON to Excel for {area_name}: {e}")
+
 async def main():
     parser = argparse.ArgumentParser(description="Talabat Groceries Scraper")
     parser.add_argument('--area-name', type=str, help="Name of the area to scrape")
@@ -1199,17 +2023,30 @@ async def main():
     args = parser.parse_args()
 
     scraper = MainScraper()
+    await scraper.setup()
     if args.area_name and args.url:
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            await scraper.scrape_and_save_area(args.area_name, args.url, browser)
+            browser = await launch_or_connect(p)
+            context = await new_scraper_context(browser)
+            await scraper.scrape_and_save_area(args.area_name, args.url, browser, context)
+            await save_storage_state(context)
+            scraper.page_pool.clear()
+            await context.close()
             await browser.close()
+        await scraper.close_http_session()
+        await scraper.wait_for_excel_exports()
+        await scraper.flush_commits()
     else:
         await scraper.run()
 
-if __name__ == "__main__":
+def run_main():
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
 
+if __name__ == "__main__":
+    run_main()
+
 
 
 
@@ -4,7 +4,6 @@ import os
 import re
 import nest_asyncio
 from bs4 import BeautifulSoup
-import pandas as pd
 from playwright.async_api import async_playwright
 from SavingOnDrive import SavingOnDrive
 